@@ -12,23 +12,15 @@ from .routes import (
     leads,
     media,
     portal,
-    auth,
-    clients,
-    finance,
-    itineraries,
-    leads,
-    media,
     reports,
     suppliers,
     tour_packages,
 )
+from .responses import DecimalORJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=DecimalORJSONResponse)
 router.include_router(auth.router)
 router.include_router(agency_users.router)
-from .routes import clients, finance, itineraries, leads, reports, tour_packages
-
-router = APIRouter()
 router.include_router(clients.router)
 router.include_router(leads.router)
 router.include_router(tour_packages.router)
@@ -39,9 +31,6 @@ router.include_router(reports.router)
 router.include_router(suppliers.router)
 router.include_router(media.router)
 router.include_router(portal.router)
-router.include_router(reports.router)
-router.include_router(suppliers.router)
-router.include_router(media.router)
 router.include_router(admin.router)
 
 __all__ = ["router"]
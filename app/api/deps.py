@@ -1,11 +1,17 @@
 """Shared FastAPI dependencies."""
 from __future__ import annotations
 
-import json
-from datetime import date
-from typing import Annotated, Generator, List, Optional
-
-from fastapi import Depends, Header, HTTPException, Query, status
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import lru_cache
+from operator import attrgetter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime
+from typing import Annotated, Any, Generator, List, Optional, Tuple, TypeVar
+
+import orjson
+from fastapi import Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
@@ -15,6 +21,10 @@ from sqlalchemy.orm import Session
 
 from ..database import SessionLocal
 
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+_SEGMENTS_ADAPTER = TypeAdapter(List[schemas.FlightSearchSegment])
+
 
 def get_db() -> Generator[Session, None, None]:
     """Provide a scoped database session to request handlers."""
@@ -29,7 +39,117 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_flight_search_request(
+def model_from_row(schema: type[SchemaT], row: object) -> SchemaT:
+    """Build a response schema from a trusted ORM row without re-validating it.
+
+    Rows loaded through SQLAlchemy already match the column types, so the
+    Pydantic validation pipeline is skipped. Only use this for flat schemas
+    whose fields map directly onto column attributes; schemas with nested
+    relationships or normalizing validators must keep ``model_validate``.
+    """
+
+    return schema.model_construct(**_row_values(schema, row))
+
+
+def _row_values(schema: type[BaseModel], row: object) -> dict[str, Any]:
+    """Read the schema's fields off ``row`` as a plain dict."""
+
+    fields, getter = _row_getter(schema)
+    values = getter(row)
+    if len(fields) == 1:
+        values = (values,)
+    return dict(zip(fields, values))
+
+
+@lru_cache(maxsize=None)
+def _row_getter(schema: type[BaseModel]) -> tuple[tuple[str, ...], attrgetter]:
+    """Return the schema's field names and a single getter for all of them."""
+
+    fields = tuple(schema.model_fields)
+    return fields, attrgetter(*fields)
+
+
+def stream_json_array(
+    db: Session,
+    load_rows: Callable[[Session], Iterable[Any]],
+    schema: type[BaseModel],
+    *,
+    flat: bool = False,
+) -> StreamingResponse:
+    """Stream ORM rows as a JSON array, serializing one row at a time.
+
+    FastAPI closes the request session before the response body is sent, so
+    ``load_rows`` runs against a dedicated ``SessionLocal`` session bound to
+    the same engine. Pass ``flat=True`` for schemas that qualify for
+    :func:`model_from_row`; their column values are dumped with orjson
+    directly instead of going through ``model_validate``.
+    """
+
+    bind = db.get_bind()
+
+    def _encode(row: Any) -> bytes:
+        if flat:
+            return orjson.dumps(_row_values(schema, row))
+        return schema.model_validate(row).model_dump_json().encode()
+
+    def _chunks() -> Iterator[bytes]:
+        with SessionLocal(bind=bind) as session:
+            yield b"["
+            for index, row in enumerate(load_rows(session)):
+                if index:
+                    yield b","
+                yield _encode(row)
+            yield b"]"
+
+    return StreamingResponse(_chunks(), media_type="application/json")
+
+
+def make_etag(row_id: int, updated_at: datetime) -> str:
+    """Build a weak validator for a row from its id and last update time."""
+
+    return f'W/"{row_id}-{updated_at.isoformat()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return whether the request's If-None-Match header already holds ``etag``."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@lru_cache(maxsize=None)
+def _cursor_adapter(sort_type: type) -> TypeAdapter:
+    return TypeAdapter(Tuple[sort_type, int])
+
+
+def encode_cursor(key: tuple[Any, int] | None, sort_type: type) -> str | None:
+    """Turn the last row's ``(sort value, id)`` key into an opaque cursor."""
+
+    if key is None:
+        return None
+    raw = _cursor_adapter(sort_type).dump_json(key)
+    return urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str | None, sort_type: type) -> tuple[Any, int] | None:
+    """Decode a cursor produced by :func:`encode_cursor`, rejecting tampering."""
+
+    if not cursor:
+        return None
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return _cursor_adapter(sort_type).validate_json(raw)
+    except (ValueError, ValidationError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+
+async def get_flight_search_request(
     trip_type: str = Query(
         "one_way", description="Journey type such as one_way, round_trip, or multi_city"
     ),
@@ -50,32 +170,29 @@ def get_flight_search_request(
         None, description="Preferred cabin such as ECONOMY, PREMIUM_ECONOMY, BUSINESS"
     ),
 ) -> schemas.FlightSearchRequest:
-    """Parse raw query parameters into a validated flight search request."""
+    """Parse raw query parameters into a validated flight search request.
+
+    Parsing is pure CPU work, so the dependency runs on the event loop and
+    the async search route needs no extra threadpool hop to resolve it.
+    """
 
     segment_models: Optional[List[schemas.FlightSearchSegment]] = None
-    if segments:
+    segments = segments.strip() if segments else ""
+    if segments == "[]":
+        segment_models = []
+    elif segments and segments[0] != "[":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="segments must decode to a JSON array",
+        )
+    elif segments:
         try:
-            raw_segments = json.loads(segments)
-        except json.JSONDecodeError as exc:
+            segment_models = _SEGMENTS_ADAPTER.validate_json(segments)
+        except ValidationError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="segments must be a JSON array of segment objects",
+                detail=exc.errors(include_url=False),
             ) from exc
-        if not isinstance(raw_segments, list):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="segments must decode to a JSON array",
-            )
-        segment_models = []
-        for index, item in enumerate(raw_segments):
-            if not isinstance(item, dict):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"segment at position {index} must be a JSON object",
-                )
-            segment_models.append(
-                schemas.FlightSearchSegment.model_validate(item)
-            )
 
     return schemas.FlightSearchRequest(
         trip_type=trip_type,
@@ -0,0 +1,28 @@
+"""Response classes shared by the API routers."""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> Any:
+    # orjson encodes dates, datetimes, UUIDs and enums natively; money columns
+    # are the only values it hands back, so no isinstance chain is needed.
+    # Strings keep every digit, matching how the Pydantic schemas dump Decimal.
+    if type(value) is Decimal:
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class DecimalORJSONResponse(ORJSONResponse):
+    """``ORJSONResponse`` that also encodes ``Decimal`` values as JSON strings."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
@@ -4,10 +4,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from ... import crud, schemas
-from ..deps import get_db, require_super_admin
+from ... import cache, crud, schemas
+from ..deps import get_db, model_from_row, require_super_admin, stream_json_array
+from ..responses import DecimalORJSONResponse
 from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
 from sqlalchemy.orm import Session
 
@@ -15,10 +17,14 @@ from ... import crud, schemas
 from ..deps import get_db
 
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], default_response_class=DecimalORJSONResponse)
 
 
-@router.get("/agencies", response_model=list[schemas.TravelAgency])
+@router.get(
+    "/agencies",
+    response_model=None,
+    responses={200: {"model": list[schemas.TravelAgency]}},
+)
 def list_agencies(db: Session = Depends(get_db)) -> list[schemas.TravelAgency]:
     agencies = crud.list_travel_agencies(db)
     return [schemas.TravelAgency.model_validate(agency) for agency in agencies]
@@ -45,10 +51,19 @@ def update_agency(
     return schemas.TravelAgency.model_validate(agency)
 
 
-@router.get("/packages", response_model=list[schemas.SubscriptionPackage])
+@router.get(
+    "/packages",
+    response_model=None,
+    responses={200: {"model": list[schemas.SubscriptionPackage]}},
+)
 def list_packages(db: Session = Depends(get_db)) -> list[schemas.SubscriptionPackage]:
-    packages = crud.list_subscription_packages(db)
-    return [schemas.SubscriptionPackage.model_validate(pkg) for pkg in packages]
+    return cache.get_or_load(
+        cache.SUBSCRIPTION_PACKAGES_KEY,
+        lambda: [
+            schemas.SubscriptionPackage.model_validate(pkg)
+            for pkg in crud.list_subscription_packages(db)
+        ],
+    )
 
 
 @router.post(
@@ -78,14 +93,18 @@ def update_package(
 
 @router.get(
     "/subscriptions",
-    response_model=list[schemas.AgencySubscription],
+    response_model=None,
+    responses={200: {"model": list[schemas.AgencySubscription]}},
 )
 def list_subscriptions(
     agency_id: Annotated[int | None, Query(gt=0)] = None,
     db: Session = Depends(get_db),
-) -> list[schemas.AgencySubscription]:
-    subscriptions = crud.list_agency_subscriptions(db, agency_id=agency_id)
-    return [schemas.AgencySubscription.model_validate(sub) for sub in subscriptions]
+) -> StreamingResponse:
+    return stream_json_array(
+        db,
+        lambda session: crud.iter_agency_subscriptions(session, agency_id=agency_id),
+        schemas.AgencySubscription,
+    )
 
 
 @router.post(
@@ -96,9 +115,12 @@ def list_subscriptions(
 def create_subscription(
     payload: schemas.AgencySubscriptionCreate, db: Session = Depends(get_db)
 ) -> schemas.AgencySubscription:
-    if not crud.get_travel_agency(db, payload.agency_id):
+    agency_exists, package_exists = crud.check_agency_and_package_exist(
+        db, payload.agency_id, payload.package_id
+    )
+    if not agency_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agency not found")
-    if not crud.get_subscription_package(db, payload.package_id):
+    if not package_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Package not found")
     subscription = crud.create_agency_subscription(db, payload)
     subscription = crud.get_agency_subscription(db, subscription.id) or subscription
@@ -132,10 +154,14 @@ def create_integration_key(
     if not crud.get_travel_agency(db, payload.agency_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agency not found")
     credential = crud.create_integration_credential(db, payload)
-    return schemas.IntegrationCredential.model_validate(credential)
+    return model_from_row(schemas.IntegrationCredential, credential)
 
 
-@router.put("/api-keys/{credential_id}", response_model=schemas.IntegrationCredential)
+@router.put(
+    "/api-keys/{credential_id}",
+    response_model=None,
+    responses={200: {"model": schemas.IntegrationCredential}},
+)
 def update_integration_key(
     credential_id: int,
     payload: schemas.IntegrationCredentialUpdate,
@@ -145,19 +171,27 @@ def update_integration_key(
     if not credential:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Credential not found")
     credential = crud.update_integration_credential(db, credential, payload)
-    return schemas.IntegrationCredential.model_validate(credential)
+    return model_from_row(schemas.IntegrationCredential, credential)
 
 
-@router.get("/api-keys", response_model=list[schemas.IntegrationCredential])
+@router.get(
+    "/api-keys",
+    response_model=None,
+    responses={200: {"model": list[schemas.IntegrationCredential]}},
+)
 def list_integration_keys(db: Session = Depends(get_db)) -> list[schemas.IntegrationCredential]:
     credentials = crud.list_integration_credentials(db)
-    return [schemas.IntegrationCredential.model_validate(cred) for cred in credentials]
+    return [model_from_row(schemas.IntegrationCredential, cred) for cred in credentials]
 
 
-@router.get("/payment-gateways", response_model=list[schemas.PaymentGateway])
+@router.get(
+    "/payment-gateways",
+    response_model=None,
+    responses={200: {"model": list[schemas.PaymentGateway]}},
+)
 def list_payment_gateways(db: Session = Depends(get_db)) -> list[schemas.PaymentGateway]:
     gateways = crud.list_payment_gateways(db)
-    return [schemas.PaymentGateway.model_validate(gateway) for gateway in gateways]
+    return [model_from_row(schemas.PaymentGateway, gateway) for gateway in gateways]
 
 
 @router.post(
@@ -171,12 +205,13 @@ def create_payment_gateway(
     if payload.agency_id and not crud.get_travel_agency(db, payload.agency_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agency not found")
     gateway = crud.create_payment_gateway(db, payload)
-    return schemas.PaymentGateway.model_validate(gateway)
+    return model_from_row(schemas.PaymentGateway, gateway)
 
 
 @router.put(
     "/payment-gateways/{gateway_id}",
-    response_model=schemas.PaymentGateway,
+    response_model=None,
+    responses={200: {"model": schemas.PaymentGateway}},
 )
 def update_payment_gateway(
     gateway_id: Annotated[int, Path(gt=0)],
@@ -189,7 +224,7 @@ def update_payment_gateway(
     if payload.agency_id and not crud.get_travel_agency(db, payload.agency_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agency not found")
     gateway = crud.update_payment_gateway(db, gateway, payload)
-    return schemas.PaymentGateway.model_validate(gateway)
+    return model_from_row(schemas.PaymentGateway, gateway)
 
 
 @router.delete("/payment-gateways/{gateway_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -203,39 +238,69 @@ def delete_payment_gateway(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/notifications", response_model=list[schemas.NotificationLog])
-def list_notifications(db: Session = Depends(get_db)) -> list[schemas.NotificationLog]:
-    notifications = crud.list_notifications(db)
-    return [schemas.NotificationLog.model_validate(notification) for notification in notifications]
+@router.get(
+    "/notifications",
+    response_model=None,
+    responses={200: {"model": list[schemas.NotificationLog]}},
+)
+def list_notifications(db: Session = Depends(get_db)) -> StreamingResponse:
+    return stream_json_array(db, crud.iter_notifications, schemas.NotificationLog, flat=True)
 
 
-@router.get("/notifications/summary", response_model=schemas.NotificationSummary)
+@router.get(
+    "/notifications/summary",
+    response_model=None,
+    responses={200: {"model": schemas.NotificationSummary}},
+)
 def notifications_summary(db: Session = Depends(get_db)) -> schemas.NotificationSummary:
     return crud.notification_summary(db)
 
 
-@router.get("/analytics/overview", response_model=schemas.AnalyticsOverview)
+@router.get(
+    "/analytics/overview",
+    response_model=None,
+    responses={200: {"model": schemas.AnalyticsOverview}},
+)
 def analytics_overview(db: Session = Depends(get_db)) -> schemas.AnalyticsOverview:
     return crud.get_analytics_overview(db)
 
 
-@router.get("/settings", response_model=list[schemas.SiteSetting])
+@router.get(
+    "/settings",
+    response_model=None,
+    responses={200: {"model": list[schemas.SiteSetting]}},
+)
 def list_settings(db: Session = Depends(get_db)) -> list[schemas.SiteSetting]:
-    settings = crud.list_site_settings(db)
-    return [schemas.SiteSetting.model_validate(setting) for setting in settings]
+    return cache.get_or_load(
+        cache.SITE_SETTINGS_KEY,
+        lambda: [
+            model_from_row(schemas.SiteSetting, setting)
+            for setting in crud.list_site_settings(db)
+        ],
+    )
 
 
-@router.put("/settings/{key}", response_model=schemas.SiteSetting)
+@router.put(
+    "/settings/{key}",
+    response_model=None,
+    responses={200: {"model": schemas.SiteSetting}},
+)
 def update_setting(key: str, payload: schemas.SiteSettingUpdate, db: Session = Depends(get_db)) -> schemas.SiteSetting:
     setting = crud.upsert_site_setting(db, key=key, value=payload.value)
-    return schemas.SiteSetting.model_validate(setting)
+    return model_from_row(schemas.SiteSetting, setting)
 
 
-@router.get("/landing-page", response_model=schemas.LandingPageContent)
+@router.get(
+    "/landing-page",
+    response_model=None,
+    responses={200: {"model": schemas.LandingPageContent}},
+)
 def get_landing_page(
     db: Session = Depends(get_db), _=Depends(require_super_admin)
 ) -> schemas.LandingPageContent:
-    return crud.get_landing_page_content(db)
+    return cache.get_or_load(
+        cache.LANDING_PAGE_KEY, lambda: crud.get_landing_page_content(db)
+    )
 
 
 @router.put("/landing-page", response_model=schemas.LandingPageContent)
@@ -247,10 +312,13 @@ def update_landing_page(
     return crud.update_landing_page_content(db, payload)
 
 
-@router.get("/media", response_model=list[schemas.MediaAsset])
-def list_all_media(db: Session = Depends(get_db)) -> list[schemas.MediaAsset]:
-    assets = crud.list_media_assets(db)
-    return [schemas.MediaAsset.model_validate(asset) for asset in assets]
+@router.get(
+    "/media",
+    response_model=None,
+    responses={200: {"model": list[schemas.MediaAsset]}},
+)
+def list_all_media(db: Session = Depends(get_db)) -> StreamingResponse:
+    return stream_json_array(db, crud.iter_media_assets, schemas.MediaAsset)
 
 
 @router.patch("/media/{asset_id}", response_model=schemas.MediaAsset)
@@ -60,9 +60,8 @@ def update_agency_user(
     payload: schemas.AgencyUserUpdate = ...,  # noqa: B008
     db: Session = Depends(get_db),
 ) -> schemas.User:
-    _get_agency_or_404(db, agency_id)
-    user = crud.get_user(db, user_id)
-    if not user or user.agency_id != agency_id:
+    user = crud.get_agency_user(db, agency_id, user_id)
+    if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     update_data: dict[str, object] = {}
@@ -91,9 +90,8 @@ def delete_agency_user(
     user_id: int = Path(gt=0),
     db: Session = Depends(get_db),
 ) -> Response:
-    _get_agency_or_404(db, agency_id)
-    user = crud.get_user(db, user_id)
-    if not user or user.agency_id != agency_id:
+    user = crud.get_agency_user(db, agency_id, user_id)
+    if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     crud.delete_user(db, user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
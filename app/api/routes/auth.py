@@ -1,14 +1,15 @@
 """Authentication routes supporting signup, login, and two factor setup."""
 from __future__ import annotations
 
-import secrets
+from base64 import urlsafe_b64encode
+from os import urandom
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ... import crud, schemas
 from ...constants import ADMIN_ROLES
-from ..deps import get_db
+from ..deps import get_db, model_from_row
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -42,9 +43,10 @@ def signup(payload: schemas.SignupRequest, db: Session = Depends(get_db)) -> sch
     else:
         role = "staff"
 
+    # SignupRequest has already validated every field, so skip re-validation.
     user = crud.create_user(
         db,
-        schemas.UserCreate(
+        schemas.UserCreate.model_construct(
             email=payload.email,
             password=payload.password,
             full_name=payload.full_name,
@@ -54,10 +56,9 @@ def signup(payload: schemas.SignupRequest, db: Session = Depends(get_db)) -> sch
             is_admin=role in ADMIN_ROLES,
             is_super_admin=False,
             role=role,
-            is_admin=False,
         ),
     )
-    return user
+    return model_from_row(schemas.User, user)
 
 
 @router.post("/login", response_model=schemas.LoginResponse)
@@ -79,7 +80,7 @@ def login(payload: schemas.LoginRequest, db: Session = Depends(get_db)) -> schem
     if not authenticated:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    token = secrets.token_urlsafe(32)
+    token = urlsafe_b64encode(urandom(32)).rstrip(b"=").decode("ascii")
     crud.log_notification(
         db,
         event_type="user.login",
@@ -89,6 +90,8 @@ def login(payload: schemas.LoginRequest, db: Session = Depends(get_db)) -> schem
         message="You have signed in to the Tour Planner dashboard.",
         metadata={"user_id": user.id},
         user=user,
+        # Written by the request's single commit; nothing here reads it back.
+        flush=False,
     )
     return schemas.LoginResponse(access_token=token, user=schemas.User.model_validate(user))
 
@@ -123,5 +126,6 @@ def activate_two_factor(
         message="Two-factor authentication is now active on your account.",
         metadata={"user_id": user.id},
         user=updated,
+        flush=False,
     )
     return schemas.User.model_validate(updated)
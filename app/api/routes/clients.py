@@ -1,13 +1,13 @@
 """Client management endpoints."""
 from __future__ import annotations
 
-from typing import List
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ... import crud, models, schemas
-from ..deps import get_db
+from ..deps import decode_cursor, encode_cursor, etag_matches, get_db, make_etag
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
@@ -17,29 +17,34 @@ def create_client(client_in: schemas.ClientCreate, db: Session = Depends(get_db)
     return crud.create_client(db, client_in)
 
 
-@router.get("", response_model=List[schemas.Client])
+@router.get("", response_model=schemas.Page[schemas.Client])
 def list_clients(
     db: Session = Depends(get_db),
     search: str | None = Query(None, description="Filter clients by name or email substring"),
-) -> List[models.Client]:
-    clients = crud.list_clients(db)
-    if search:
-        lowered = search.lower()
-        clients = [
-            client
-            for client in clients
-            if lowered in (client.name or "").lower()
-            or lowered in (client.email or "").lower()
-        ]
-    return list(clients)
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    clients, next_key = crud.list_clients_page(
+        db, search=search, after=decode_cursor(cursor, str), limit=limit
+    )
+    return {"items": clients, "next_cursor": encode_cursor(next_key, str)}
 
 
 @router.get("/{client_id}", response_model=schemas.Client)
-def get_client(client_id: int = Path(..., gt=0), db: Session = Depends(get_db)) -> models.Client:
-    client = crud.get_client(db, client_id)
-    if not client:
+def get_client(
+    request: Request,
+    response: Response,
+    client_id: int = Path(..., gt=0),
+    db: Session = Depends(get_db),
+) -> models.Client | Response:
+    updated_at = crud.get_updated_at(db, models.Client, client_id)
+    if updated_at is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
-    return client
+    etag = make_etag(client_id, updated_at)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return crud.get_client(db, client_id)
 
 
 @router.put("/{client_id}", response_model=schemas.Client)
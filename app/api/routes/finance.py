@@ -2,44 +2,57 @@
 from __future__ import annotations
 
 from datetime import date
-"""Finance endpoints covering invoices, payments, and expenses."""
-from __future__ import annotations
-
+from decimal import Decimal
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ... import crud, models, schemas
-from ...utils import (
-    compute_outstanding_balance,
-    initiate_payment_with_provider,
-    list_supported_payment_providers,
-)
-from ...utils import compute_outstanding_balance
-from ..deps import get_db
+from ...utils import initiate_payment_with_provider, list_supported_payment_providers
+from ..deps import decode_cursor, encode_cursor, etag_matches, get_db, make_etag
+from ..responses import DecimalORJSONResponse
 
 router = APIRouter(prefix="/finance", tags=["finance"])
 
+_CENT = Decimal("0.01")
+
+# Provider metadata is static configuration, so validate it once at import.
+_PAYMENT_PROVIDERS = tuple(
+    schemas.PaymentProviderInfo(**provider) for provider in list_supported_payment_providers()
+)
+
 
 @router.post("/invoices", response_model=schemas.Invoice, status_code=status.HTTP_201_CREATED)
 def create_invoice(invoice_in: schemas.InvoiceCreate, db: Session = Depends(get_db)) -> models.Invoice:
     invoice = crud.create_invoice(db, invoice_in)
-    db.refresh(invoice)
     return invoice
 
 
-@router.get("/invoices", response_model=List[schemas.Invoice])
-def list_invoices(db: Session = Depends(get_db)) -> List[models.Invoice]:
-    return list(crud.list_invoices(db))
+@router.get("/invoices", response_model=schemas.Page[schemas.Invoice])
+def list_invoices(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    invoices, next_key = crud.list_invoices_page(
+        db, after=decode_cursor(cursor, date), limit=limit
+    )
+    return {"items": invoices, "next_cursor": encode_cursor(next_key, date)}
 
 
 @router.get("/invoices/{invoice_id}", response_model=schemas.Invoice)
-def get_invoice(invoice_id: int, db: Session = Depends(get_db)) -> models.Invoice:
-    invoice = crud.get_invoice(db, invoice_id)
-    if not invoice:
+def get_invoice(
+    invoice_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+) -> models.Invoice | Response:
+    updated_at = crud.get_updated_at(db, models.Invoice, invoice_id)
+    if updated_at is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
-    return invoice
+    etag = make_etag(invoice_id, updated_at)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return db.get(models.Invoice, invoice_id)
 
 
 @router.put("/invoices/{invoice_id}", response_model=schemas.Invoice)
@@ -52,7 +65,6 @@ def update_invoice(
     if not invoice:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
     invoice = crud.update_invoice(db, invoice, invoice_in)
-    db.refresh(invoice)
     return invoice
 
 
@@ -92,13 +104,19 @@ def create_payment(payment_in: schemas.PaymentCreate, db: Session = Depends(get_
         payment_in = schemas.PaymentCreate(**payload)
 
     payment = crud.create_payment(db, payment_in)
-    db.refresh(payment)
     return payment
 
 
-@router.get("/payments", response_model=List[schemas.Payment])
-def list_payments(db: Session = Depends(get_db)) -> List[models.Payment]:
-    return list(crud.list_payments(db))
+@router.get("/payments", response_model=schemas.Page[schemas.Payment])
+def list_payments(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    payments, next_key = crud.list_payments_page(
+        db, after=decode_cursor(cursor, date), limit=limit
+    )
+    return {"items": payments, "next_cursor": encode_cursor(next_key, date)}
 
 
 @router.get(
@@ -107,8 +125,7 @@ def list_payments(db: Session = Depends(get_db)) -> List[models.Payment]:
     summary="List supported payment providers",
 )
 def payment_providers() -> List[schemas.PaymentProviderInfo]:
-    providers = list_supported_payment_providers()
-    return [schemas.PaymentProviderInfo(**provider) for provider in providers]
+    return list(_PAYMENT_PROVIDERS)
 
 
 @router.post(
@@ -147,7 +164,6 @@ def initiate_payment(
             notes=payload.customer_reference,
         ),
     )
-    db.refresh(payment)
 
     message = (
         "Payment requires customer action to complete."
@@ -175,7 +191,6 @@ def update_payment(
     if not payment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
     payment = crud.update_payment(db, payment, payment_in)
-    db.refresh(payment)
     return payment
 
 
@@ -191,13 +206,19 @@ def delete_payment(payment_id: int, db: Session = Depends(get_db)) -> Response:
 @router.post("/expenses", response_model=schemas.Expense, status_code=status.HTTP_201_CREATED)
 def create_expense(expense_in: schemas.ExpenseCreate, db: Session = Depends(get_db)) -> models.Expense:
     expense = crud.create_expense(db, expense_in)
-    db.refresh(expense)
     return expense
 
 
-@router.get("/expenses", response_model=List[schemas.Expense])
-def list_expenses(db: Session = Depends(get_db)) -> List[models.Expense]:
-    return list(crud.list_expenses(db))
+@router.get("/expenses", response_model=schemas.Page[schemas.Expense])
+def list_expenses(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    expenses, next_key = crud.list_expenses_page(
+        db, after=decode_cursor(cursor, date), limit=limit
+    )
+    return {"items": expenses, "next_cursor": encode_cursor(next_key, date)}
 
 
 @router.put("/expenses/{expense_id}", response_model=schemas.Expense)
@@ -210,7 +231,6 @@ def update_expense(
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
     expense = crud.update_expense(db, expense, expense_in)
-    db.refresh(expense)
     return expense
 
 
@@ -223,30 +243,19 @@ def delete_expense(expense_id: int, db: Session = Depends(get_db)) -> Response:
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/summary")
-def finance_summary(db: Session = Depends(get_db)) -> dict[str, Any]:
-    invoices: List[models.Invoice] = list(crud.list_invoices(db))
-    payments: List[models.Payment] = list(crud.list_payments(db))
-    expenses: List[models.Expense] = list(crud.list_expenses(db))
-
-    total_invoiced = sum(float(invoice.amount) for invoice in invoices)
-    total_paid = sum(
-        float(payment.amount)
-        for payment in payments
-        if (payment.status or "completed").lower() == "completed"
-    )
-    total_paid = sum(float(payment.amount) for payment in payments)
-    total_expenses = sum(float(expense.amount) for expense in expenses)
-
-    outstanding = sum(
-        compute_outstanding_balance(invoice.payments, float(invoice.amount)) for invoice in invoices
-    )
-    profitability = round(total_paid - total_expenses, 2)
-
-    return {
-        "total_invoiced": round(total_invoiced, 2),
-        "total_paid": round(total_paid, 2),
-        "total_expenses": round(total_expenses, 2),
-        "outstanding": round(outstanding, 2),
-        "profitability": profitability,
+@router.get("/summary", response_class=DecimalORJSONResponse)
+def finance_summary(db: Session = Depends(get_db)) -> DecimalORJSONResponse:
+    totals = crud.finance_totals(db)
+    # Every payment belongs to an invoice, so the per-invoice balances sum to
+    # the invoiced total minus the completed payments.
+    summary = {
+        **totals,
+        "outstanding": totals["total_invoiced"] - totals["total_paid"],
+        "profitability": totals["total_paid"] - totals["total_expenses"],
     }
+    # Returning the response directly skips jsonable_encoder for a flat dict
+    # that orjson already knows how to encode. The summary has always reported
+    # totals as JSON numbers, so only these cent-quantized values become floats.
+    return DecimalORJSONResponse(
+        {key: float(value.quantize(_CENT)) for key, value in summary.items()}
+    )
@@ -1,96 +1,154 @@
 """Flight booking panel endpoints leveraging Amadeus integrations."""
 from __future__ import annotations
 
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from ... import crud, schemas, utils
-from ..deps import get_db, get_flight_search_request
+from ... import cache, crud, models, schemas, utils
+from ...constants import PRINTABLE_CACHE_CONTROL
+from ..deps import (
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+    get_db,
+    get_flight_search_request,
+    make_etag,
+)
 
 router = APIRouter(prefix="/flights", tags=["flights"])
 
+# Provider metadata is static configuration, so validate it once at import.
+_FLIGHT_PROVIDERS = tuple(
+    schemas.FlightProvider.model_validate(provider)
+    for provider in utils.list_available_flight_providers()
+)
+_FLIGHT_OFFERS_ADAPTER = TypeAdapter(List[schemas.FlightOffer])
+_SEARCH_SEGMENTS_ADAPTER = TypeAdapter(List[schemas.FlightSearchSegment])
+
 
 @router.get("/providers", response_model=List[schemas.FlightProvider])
 def list_providers() -> List[schemas.FlightProvider]:
-    providers = utils.list_available_flight_providers()
-    return [schemas.FlightProvider.model_validate(provider) for provider in providers]
+    return list(_FLIGHT_PROVIDERS)
 
 
-@router.get("/search", response_model=List[schemas.FlightOffer])
-def search_flights(
+@router.get(
+    "/search",
+    response_model=None,
+    responses={200: {"model": List[schemas.FlightOffer]}},
+)
+async def search_flights(
     params: Annotated[
         schemas.FlightSearchRequest, Depends(get_flight_search_request)
     ],
     provider: Annotated[str, Query(description="Flight provider identifier")] = "amadeus",
-) -> List[schemas.FlightOffer]:
+) -> Response:
     provider_key = provider.lower()
     if provider_key != "amadeus":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only the Amadeus provider is currently supported",
         )
-    offers = utils.search_amadeus_flights(
-        trip_type=params.trip_type,
-        origin=params.origin,
-        destination=params.destination,
-        departure_date=params.departure_date,
-        return_date=params.return_date,
-        segments=[segment.model_dump() for segment in params.segments]
-        if params.segments
-        else None,
-        passengers=params.passengers,
-        travel_class=params.travel_class,
+
+    def _search() -> bytes:
+        offers = utils.search_amadeus_flights(
+            trip_type=params.trip_type,
+            origin=params.origin,
+            destination=params.destination,
+            departure_date=params.departure_date,
+            return_date=params.return_date,
+            segments=_SEARCH_SEGMENTS_ADAPTER.dump_python(params.segments)
+            if params.segments
+            else None,
+            passengers=params.passengers,
+            travel_class=params.travel_class,
+        )
+        # Validate and encode the whole list in pydantic-core; FastAPI's own
+        # response validation would only repeat the first step.
+        validated = _FLIGHT_OFFERS_ADAPTER.validate_python(offers)
+        return _FLIGHT_OFFERS_ADAPTER.dump_json(validated)
+
+    # Users re-run the same search while adjusting filters, so identical
+    # requests share one encoded result for a short window. The search treats
+    # codes, trip types and cabins case-insensitively, and so does the key.
+    # The provider call, the offer validation and the cache lock all block, so
+    # they run in a worker thread rather than on the event loop.
+    content = await run_in_threadpool(
+        cache.get_or_load,
+        cache.FLIGHT_SEARCH_KEY_PREFIX + params.model_dump_json().lower(),
+        _search,
+        ttl=cache.FLIGHT_SEARCH_TTL_SECONDS,
     )
-    return [schemas.FlightOffer.model_validate(offer) for offer in offers]
+    return Response(content=content, media_type="application/json")
 
 
-@router.get("/bookings", response_model=List[schemas.FlightBooking])
+@router.get("/bookings", response_model=schemas.Page[schemas.FlightBooking])
 def list_bookings(
     agency_id: Annotated[int | None, Query(gt=0)] = None,
     client_id: Annotated[int | None, Query(gt=0)] = None,
     itinerary_id: Annotated[int | None, Query(gt=0)] = None,
     status_filter: Annotated[str | None, Query(alias="status")] = None,
+    cursor: Annotated[str | None, Query(description="next_cursor from the previous page")] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
     db: Session = Depends(get_db),
-) -> List[schemas.FlightBooking]:
-    bookings = crud.list_flight_bookings(
+) -> dict[str, Any]:
+    bookings, next_key = crud.list_flight_bookings_page(
         db,
         agency_id=agency_id,
         client_id=client_id,
         itinerary_id=itinerary_id,
         status=status_filter,
+        after=decode_cursor(cursor, datetime),
+        limit=limit,
     )
-    return [schemas.FlightBooking.model_validate(booking) for booking in bookings]
+    return {"items": bookings, "next_cursor": encode_cursor(next_key, datetime)}
 
 
 @router.post("/bookings", response_model=schemas.FlightBooking, status_code=status.HTTP_201_CREATED)
 def create_booking(
     payload: schemas.FlightBookingCreate, db: Session = Depends(get_db)
 ) -> schemas.FlightBooking:
-    if not crud.get_travel_agency(db, payload.agency_id):
+    agency_found, client_found, itinerary_found, has_module = crud.validate_booking_refs(
+        db,
+        agency_id=payload.agency_id,
+        client_id=payload.client_id,
+        itinerary_id=payload.itinerary_id,
+        module="flight_booking",
+    )
+    if not agency_found:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agency not found")
-    if payload.client_id and not crud.get_client(db, payload.client_id):
+    if not client_found:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
-    if payload.itinerary_id and not crud.get_itinerary(db, payload.itinerary_id):
+    if not itinerary_found:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
-    if not crud.agency_has_module(db, payload.agency_id, "flight_booking"):
+    if not has_module:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Agency subscription does not include flight booking",
         )
     booking = crud.create_flight_booking(db, payload)
-    booking = crud.get_flight_booking(db, booking.id) or booking
     return schemas.FlightBooking.model_validate(booking)
 
 
 @router.get("/bookings/{booking_id}", response_model=schemas.FlightBooking)
-def get_booking(booking_id: int, db: Session = Depends(get_db)) -> schemas.FlightBooking:
-    booking = crud.get_flight_booking(db, booking_id)
-    if not booking:
+def get_booking(
+    booking_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+) -> schemas.FlightBooking | Response:
+    # Segments are only written together with their booking, so the booking
+    # row's updated_at also versions them.
+    updated_at = crud.get_updated_at(db, models.FlightBooking, booking_id)
+    if updated_at is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
-    return schemas.FlightBooking.model_validate(booking)
+    etag = make_etag(booking_id, updated_at)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return schemas.FlightBooking.model_validate(crud.get_flight_booking(db, booking_id))
 
 
 @router.put("/bookings/{booking_id}", response_model=schemas.FlightBooking)
@@ -101,7 +159,6 @@ def update_booking(
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
     booking = crud.update_flight_booking(db, booking, payload)
-    booking = crud.get_flight_booking(db, booking.id) or booking
     return schemas.FlightBooking.model_validate(booking)
 
 
@@ -119,7 +176,6 @@ def issue_ticket(
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
     booking = crud.issue_flight_tickets(db, booking, payload)
-    booking = crud.get_flight_booking(db, booking.id) or booking
     return schemas.FlightBooking.model_validate(booking)
 
 
@@ -133,7 +189,7 @@ def render_ticket(booking_id: int, db: Session = Depends(get_db)) -> HTMLRespons
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
     html = utils.render_flight_ticket(booking)
-    return HTMLResponse(content=html)
+    return HTMLResponse(content=html, headers={"Cache-Control": PRINTABLE_CACHE_CONTROL})
 
 
 __all__ = ["router"]
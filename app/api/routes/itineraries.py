@@ -1,24 +1,41 @@
 """Itinerary management endpoints."""
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import date
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
 from ... import crud, models, schemas
+from ...constants import PRINTABLE_CACHE_CONTROL
 from ...utils import render_itinerary, render_travel_document
-from ...utils import render_itinerary
-from ..deps import get_db
+from ..deps import decode_cursor, encode_cursor, get_db
 
 router = APIRouter(prefix="/itineraries", tags=["itineraries"])
 
 
+def _get_itinerary_or_404(itinerary_id: int, db: Session = Depends(get_db)) -> models.Itinerary:
+    """Load an itinerary with the relationships its responses and documents use."""
+
+    itinerary = crud.get_itinerary(db, itinerary_id)
+    if not itinerary:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+    return itinerary
+
+
+def _get_itinerary_row_or_404(
+    itinerary_id: int, db: Session = Depends(get_db)
+) -> models.Itinerary:
+    """Load only the itinerary row, for routes that just need it to exist."""
+
+    itinerary = db.get(models.Itinerary, itinerary_id)
+    if not itinerary:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+    return itinerary
+
+
 @router.post("", response_model=schemas.Itinerary, status_code=status.HTTP_201_CREATED)
 def create_itinerary(
     itinerary_in: schemas.ItineraryCreate, db: Session = Depends(get_db)
@@ -27,39 +44,38 @@ def create_itinerary(
         itinerary = crud.create_itinerary(db, itinerary_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    itinerary = crud.create_itinerary(db, itinerary_in)
-    db.refresh(itinerary)
     return itinerary
 
 
-@router.get("", response_model=List[schemas.Itinerary])
-def list_itineraries(db: Session = Depends(get_db)) -> List[models.Itinerary]:
-    return list(crud.list_itineraries(db))
+@router.get("", response_model=schemas.Page[schemas.Itinerary])
+def list_itineraries(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    itineraries, next_key = crud.list_itineraries_page(
+        db, after=decode_cursor(cursor, date), limit=limit
+    )
+    return {"items": itineraries, "next_cursor": encode_cursor(next_key, date)}
 
 
 @router.get("/{itinerary_id}", response_model=schemas.Itinerary)
-def get_itinerary(itinerary_id: int, db: Session = Depends(get_db)) -> models.Itinerary:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+def get_itinerary(
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
+) -> models.Itinerary:
     return itinerary
 
 
 @router.put("/{itinerary_id}", response_model=schemas.Itinerary)
 def update_itinerary(
-    itinerary_id: int,
     itinerary_in: schemas.ItineraryUpdate,
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
     db: Session = Depends(get_db),
 ) -> models.Itinerary:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     try:
         itinerary = crud.update_itinerary(db, itinerary, itinerary_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    itinerary = crud.update_itinerary(db, itinerary, itinerary_in)
-    db.refresh(itinerary)
     return itinerary
 
 
@@ -69,12 +85,11 @@ def update_itinerary(
     status_code=status.HTTP_201_CREATED,
     summary="Clone an existing itinerary to use as a template",
 )
-def duplicate_itinerary(itinerary_id: int, db: Session = Depends(get_db)) -> models.Itinerary:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+def duplicate_itinerary(
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
+    db: Session = Depends(get_db),
+) -> models.Itinerary:
     clone = crud.duplicate_itinerary(db, itinerary)
-    db.refresh(clone)
     return clone
 
 
@@ -85,15 +100,11 @@ def duplicate_itinerary(itinerary_id: int, db: Session = Depends(get_db)) -> mod
     summary="Generate an invoice from an itinerary estimate",
 )
 def invoice_itinerary(
-    itinerary_id: int,
     payload: schemas.ItineraryInvoiceCreate,
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
     db: Session = Depends(get_db),
 ) -> models.Invoice:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     invoice = crud.create_invoice_from_itinerary(db, itinerary, payload)
-    db.refresh(invoice)
     return invoice
 
 
@@ -103,13 +114,11 @@ def invoice_itinerary(
     summary="Render a printable itinerary document",
 )
 def print_itinerary(
-    itinerary_id: int,
+    response: Response,
     layout: str = Query("classic", description="Layout key such as classic, modern, gallery"),
-    db: Session = Depends(get_db),
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
 ) -> str:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+    response.headers["Cache-Control"] = PRINTABLE_CACHE_CONTROL
     return render_itinerary(itinerary, layout=layout)
 
 
@@ -119,10 +128,11 @@ def print_itinerary(
     summary="Summarize itinerary pricing with margin insights",
 )
 def pricing_summary(itinerary_id: int, db: Session = Depends(get_db)) -> schemas.PricingSummary:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
+    loaded = crud.get_itinerary_with_cost(db, itinerary_id)
+    if not loaded:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
-    return crud.get_pricing_summary(itinerary)
+    itinerary, base_cost = loaded
+    return crud.get_pricing_summary(itinerary, base_cost)
 
 
 @router.get(
@@ -131,13 +141,9 @@ def pricing_summary(itinerary_id: int, db: Session = Depends(get_db)) -> schemas
     summary="AI-assisted suggestions for enriching an itinerary",
 )
 def itinerary_suggestions(
-    itinerary_id: int,
     focus: Optional[str] = Query(None, description="Optional focus area such as pricing or wellness"),
-    db: Session = Depends(get_db),
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
 ) -> List[schemas.ItinerarySuggestion]:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     return crud.build_itinerary_suggestions(itinerary, focus=focus)
 
 
@@ -147,13 +153,9 @@ def itinerary_suggestions(
     summary="Generate an auxiliary travel document",
 )
 def generate_travel_document(
-    itinerary_id: int,
     document_type: str,
-    db: Session = Depends(get_db),
+    itinerary: models.Itinerary = Depends(_get_itinerary_or_404),
 ) -> str:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     try:
         return render_travel_document(itinerary, document_type)
     except ValueError as exc:
@@ -166,18 +168,14 @@ def generate_travel_document(
     status_code=status.HTTP_201_CREATED,
 )
 def add_collaborator(
-    itinerary_id: int,
     collaborator_in: schemas.ItineraryCollaboratorCreate,
+    itinerary: models.Itinerary = Depends(_get_itinerary_row_or_404),
     db: Session = Depends(get_db),
 ) -> models.ItineraryCollaborator:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     try:
         collaborator = crud.add_itinerary_collaborator(db, itinerary, collaborator_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    db.refresh(collaborator)
     return collaborator
 
 
@@ -186,11 +184,9 @@ def add_collaborator(
     response_model=List[schemas.ItineraryCollaborator],
 )
 def list_collaborators(
-    itinerary_id: int, db: Session = Depends(get_db)
+    itinerary: models.Itinerary = Depends(_get_itinerary_row_or_404),
+    db: Session = Depends(get_db),
 ) -> List[models.ItineraryCollaborator]:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     return list(crud.list_itinerary_collaborators(db, itinerary))
 
 
@@ -200,18 +196,14 @@ def list_collaborators(
     status_code=status.HTTP_201_CREATED,
 )
 def create_comment(
-    itinerary_id: int,
     comment_in: schemas.ItineraryCommentCreate,
+    itinerary: models.Itinerary = Depends(_get_itinerary_row_or_404),
     db: Session = Depends(get_db),
 ) -> models.ItineraryComment:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     try:
         comment = crud.create_itinerary_comment(db, itinerary, comment_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    db.refresh(comment)
     return comment
 
 
@@ -225,14 +217,13 @@ def resolve_comment(
     payload: schemas.CommentResolutionRequest,
     db: Session = Depends(get_db),
 ) -> models.ItineraryComment:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
-    comment = db.get(models.ItineraryComment, comment_id)
-    if not comment or comment.itinerary_id != itinerary.id:
+    comment = crud.get_itinerary_comment(db, itinerary_id, comment_id)
+    if not comment:
+        # Only a miss needs to know which of the two ids was unknown.
+        if db.get(models.Itinerary, itinerary_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
     updated = crud.set_comment_resolution(db, comment, payload.resolved)
-    db.refresh(updated)
     return updated
 
 
@@ -241,23 +232,16 @@ def resolve_comment(
     response_model=List[schemas.ItineraryVersion],
 )
 def list_versions(
-    itinerary_id: int, db: Session = Depends(get_db)
+    itinerary: models.Itinerary = Depends(_get_itinerary_row_or_404),
+    db: Session = Depends(get_db),
 ) -> List[models.ItineraryVersion]:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
     return list(crud.list_itinerary_versions(db, itinerary))
-def print_itinerary(itinerary_id: int, db: Session = Depends(get_db)) -> str:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
-    return render_itinerary(itinerary)
 
 
 @router.delete("/{itinerary_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_itinerary(itinerary_id: int, db: Session = Depends(get_db)) -> Response:
-    itinerary = crud.get_itinerary(db, itinerary_id)
-    if not itinerary:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+def delete_itinerary(
+    itinerary: models.Itinerary = Depends(_get_itinerary_row_or_404),
+    db: Session = Depends(get_db),
+) -> Response:
     crud.delete_itinerary(db, itinerary)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,13 +1,14 @@
 """CRM lead endpoints."""
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from ... import crud, models, schemas
-from ..deps import get_db
+from ..deps import decode_cursor, encode_cursor, get_db
 
 router = APIRouter(prefix="/leads", tags=["crm"])
 
@@ -17,9 +18,16 @@ def create_lead(lead_in: schemas.LeadCreate, db: Session = Depends(get_db)) -> m
     return crud.create_lead(db, lead_in)
 
 
-@router.get("", response_model=List[schemas.Lead])
-def list_leads(db: Session = Depends(get_db)) -> List[models.Lead]:
-    return list(crud.list_leads(db))
+@router.get("", response_model=schemas.Page[schemas.Lead])
+def list_leads(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    leads, next_key = crud.list_leads_page(
+        db, after=decode_cursor(cursor, datetime), limit=limit
+    )
+    return {"items": leads, "next_cursor": encode_cursor(next_key, datetime)}
 
 
 @router.put("/{lead_id}", response_model=schemas.Lead)
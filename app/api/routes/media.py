@@ -1,13 +1,16 @@
 """Media asset management endpoints."""
 from __future__ import annotations
 
-from typing import Annotated, Optional
+from datetime import datetime
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Path, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Path, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from ... import crud, schemas, utils
-from ..deps import get_db
+from ...constants import MAX_MEDIA_TAGS
+from ..deps import decode_cursor, encode_cursor, get_db
 
 router = APIRouter(prefix="/media", tags=["media"])
 
@@ -26,13 +29,25 @@ async def upload_media_asset(
     tags: Optional[str] = Form(None),
     db: Session = Depends(get_db),
 ) -> schemas.MediaAsset:
-    raw_bytes = await file.read()
+    if tags and sum(1 for tag in tags.split(",") if tag.strip()) > MAX_MEDIA_TAGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_MEDIA_TAGS} tags are allowed",
+        )
     try:
-        optimization = utils.optimize_image_upload(raw_bytes, file.filename or "upload.jpg")
+        # Decoding and re-encoding is CPU-bound; Pillow releases the GIL while
+        # it works, so a worker thread keeps the event loop responsive. The
+        # upload is already spooled to a temporary file, so it is read in place.
+        optimization = await run_in_threadpool(
+            utils.optimize_image_upload, file.file, file.filename or "upload.jpg"
+        )
     except ValueError as exc:  # pragma: no cover - runtime validation
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    asset = crud.create_media_asset(
+    # The session is synchronous; keep its I/O off the event loop that this
+    # async upload handler runs on.
+    asset = await run_in_threadpool(
+        crud.create_media_asset,
         db,
         filename=file.filename or optimization["optimized_path"].split("/")[-1],
         content_type=file.content_type or "image/jpeg",
@@ -44,15 +59,22 @@ async def upload_media_asset(
         agency_id=agency_id,
         uploaded_by_id=uploaded_by_id,
         alt_text=alt_text,
-        tags=tags.split(",") if tags else None,
+        # crud splits, strips and drops empty tags in a single pass.
+        tags=tags or None,
     )
     return schemas.MediaAsset.model_validate(asset)
 
 
-@router.get("/assets", response_model=list[schemas.MediaAsset])
-def list_media_assets(db: Session = Depends(get_db)) -> list[schemas.MediaAsset]:
-    assets = crud.list_media_assets(db)
-    return [schemas.MediaAsset.model_validate(asset) for asset in assets]
+@router.get("/assets", response_model=schemas.Page[schemas.MediaAsset])
+def list_media_assets(
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+) -> dict[str, Any]:
+    assets, next_key = crud.list_media_assets_page(
+        db, after=decode_cursor(cursor, datetime), limit=limit
+    )
+    return {"items": assets, "next_cursor": encode_cursor(next_key, datetime)}
 
 
 @router.get("/assets/{asset_id}", response_model=schemas.MediaAsset)
@@ -1,7 +1,7 @@
 """Client portal endpoints for traveler engagement."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import HTMLResponse
@@ -27,17 +27,19 @@ def create_portal_invitation(
         token = crud.create_portal_invitation(db, payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    db.refresh(token)
     return token
 
 
 def _get_token_or_error(db: Session, token: str) -> models.PortalAccessToken:
-    portal_token = crud.get_portal_token(db, token)
-    if not portal_token:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invitation not found")
-    if portal_token.expires_at < datetime.utcnow():
+    # expires_at is stored as naive UTC.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    portal_token = crud.get_portal_token(db, token, active_at=now)
+    if portal_token:
+        return portal_token
+    # Only misses pay for the second lookup that tells expired from unknown.
+    if crud.portal_token_exists(db, token):
         raise HTTPException(status_code=status.HTTP_410_GONE, detail="Invitation expired")
-    return portal_token
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invitation not found")
 
 
 @router.get(
@@ -48,7 +50,6 @@ def _get_token_or_error(db: Session, token: str) -> models.PortalAccessToken:
 def get_portal_context(token: str, db: Session = Depends(get_db)) -> schemas.PortalView:
     portal_token = _get_token_or_error(db, token)
     crud.record_portal_view(db, portal_token)
-    db.refresh(portal_token)
     return crud.get_portal_view(portal_token)
 
 
@@ -60,7 +61,6 @@ def get_portal_context(token: str, db: Session = Depends(get_db)) -> schemas.Por
 def get_portal_page(token: str, db: Session = Depends(get_db)) -> str:
     portal_token = _get_token_or_error(db, token)
     crud.record_portal_view(db, portal_token)
-    db.refresh(portal_token)
     view = crud.get_portal_view(portal_token)
     return render_portal_page(view, token)
 
@@ -77,7 +77,6 @@ def submit_portal_decision(
 ) -> schemas.PortalAccessToken:
     portal_token = _get_token_or_error(db, token)
     updated = crud.apply_portal_decision(db, portal_token, payload)
-    db.refresh(updated)
     return updated
 
 
@@ -93,7 +92,6 @@ def submit_portal_waiver(
 ) -> schemas.PortalAccessToken:
     portal_token = _get_token_or_error(db, token)
     updated = crud.update_portal_waiver(db, portal_token, payload)
-    db.refresh(updated)
     return updated
 
 
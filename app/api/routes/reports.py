@@ -1,9 +1,10 @@
 """Reporting endpoints for operational insights."""
 from __future__ import annotations
 
+from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from ... import crud
@@ -14,13 +15,14 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/itinerary-status")
 def itinerary_status_report(db: Session = Depends(get_db)) -> dict[str, Any]:
-    itineraries = list(crud.list_itineraries(db))
-    statuses: dict[str, int] = {}
-    for itinerary in itineraries:
-        statuses[itinerary.status] = statuses.get(itinerary.status, 0) + 1
-    return {"counts": statuses, "total": len(itineraries)}
+    statuses = crud.itinerary_status_counts(db)
+    return {"counts": statuses, "total": sum(statuses.values())}
 
 
 @router.get("/sales")
-def sales_report(db: Session = Depends(get_db)) -> dict[str, Any]:
-    return crud.sales_report(db)
+def sales_report(
+    db: Session = Depends(get_db),
+    start: date | None = Query(None, description="Earliest invoice or payment date to include"),
+    end: date | None = Query(None, description="Latest invoice or payment date to include"),
+) -> dict[str, Any]:
+    return crud.sales_report(db, start=start, end=end)
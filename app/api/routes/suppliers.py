@@ -6,23 +6,48 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from ... import crud, models, schemas
+from ... import cache, crud, models, schemas
 from ...utils import fetch_supplier_inventory, get_available_supplier_integrations
 from ..deps import get_db
 
 router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
+# Integration metadata is static configuration, so validate it once at import.
+_SUPPLIER_INTEGRATIONS = tuple(
+    schemas.SupplierIntegration(provider=provider, resources=resources)
+    for provider, resources in get_available_supplier_integrations().items()
+)
+
+
+def _get_rate_or_404(db: Session, supplier_id: int, rate_id: int) -> models.SupplierRate:
+    rate = crud.get_scoped_supplier_rate(db, supplier_id, rate_id)
+    if not rate:
+        # Only a miss needs to know which of the two ids was unknown.
+        if db.get(models.Supplier, supplier_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate not found")
+    return rate
+
 
 @router.post("", response_model=schemas.Supplier, status_code=status.HTTP_201_CREATED)
 def create_supplier(supplier_in: schemas.SupplierCreate, db: Session = Depends(get_db)) -> models.Supplier:
     supplier = crud.create_supplier(db, supplier_in)
-    db.refresh(supplier)
     return supplier
 
 
-@router.get("", response_model=List[schemas.Supplier])
-def list_suppliers(db: Session = Depends(get_db)) -> List[models.Supplier]:
-    return list(crud.list_suppliers(db))
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": List[schemas.Supplier]}},
+)
+def list_suppliers(db: Session = Depends(get_db)) -> List[schemas.Supplier]:
+    return cache.get_or_load(
+        cache.SUPPLIERS_KEY,
+        lambda: [
+            schemas.Supplier.model_validate(supplier)
+            for supplier in crud.list_suppliers(db)
+        ],
+    )
 
 
 @router.get("/{supplier_id}", response_model=schemas.Supplier)
@@ -43,7 +68,6 @@ def update_supplier(
     if not supplier:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
     supplier = crud.update_supplier(db, supplier, supplier_in)
-    db.refresh(supplier)
     return supplier
 
 
@@ -70,13 +94,13 @@ def create_supplier_rate(
     if not supplier:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
     rate = crud.create_supplier_rate(db, supplier, rate_in)
-    db.refresh(rate)
     return rate
 
 
 @router.get("/{supplier_id}/rates", response_model=List[schemas.SupplierRate])
 def list_supplier_rates(supplier_id: int, db: Session = Depends(get_db)) -> List[models.SupplierRate]:
-    supplier = crud.get_supplier(db, supplier_id)
+    # Only the row is needed here; get_supplier would also load every rate.
+    supplier = db.get(models.Supplier, supplier_id)
     if not supplier:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
     return list(crud.list_supplier_rates(db, supplier))
@@ -88,13 +112,7 @@ def get_supplier_rate(
     rate_id: int,
     db: Session = Depends(get_db),
 ) -> models.SupplierRate:
-    supplier = crud.get_supplier(db, supplier_id)
-    if not supplier:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
-    rate = crud.get_supplier_rate(db, supplier, rate_id)
-    if not rate:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate not found")
-    return rate
+    return _get_rate_or_404(db, supplier_id, rate_id)
 
 
 @router.put("/{supplier_id}/rates/{rate_id}", response_model=schemas.SupplierRate)
@@ -104,25 +122,14 @@ def update_supplier_rate(
     rate_in: schemas.SupplierRateUpdate,
     db: Session = Depends(get_db),
 ) -> models.SupplierRate:
-    supplier = crud.get_supplier(db, supplier_id)
-    if not supplier:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
-    rate = crud.get_supplier_rate(db, supplier, rate_id)
-    if not rate:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate not found")
+    rate = _get_rate_or_404(db, supplier_id, rate_id)
     rate = crud.update_supplier_rate(db, rate, rate_in)
-    db.refresh(rate)
     return rate
 
 
 @router.delete("/{supplier_id}/rates/{rate_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_supplier_rate(supplier_id: int, rate_id: int, db: Session = Depends(get_db)) -> Response:
-    supplier = crud.get_supplier(db, supplier_id)
-    if not supplier:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
-    rate = crud.get_supplier_rate(db, supplier, rate_id)
-    if not rate:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate not found")
+    rate = _get_rate_or_404(db, supplier_id, rate_id)
     crud.delete_supplier_rate(db, rate)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -130,11 +137,7 @@ def delete_supplier_rate(supplier_id: int, rate_id: int, db: Session = Depends(g
 @router.get("/integrations/providers", response_model=List[schemas.SupplierIntegration])
 def available_integrations() -> List[schemas.SupplierIntegration]:
     """Expose configured supplier integrations and supported resources."""
-    integrations = get_available_supplier_integrations()
-    return [
-        schemas.SupplierIntegration(provider=provider, resources=resources)
-        for provider, resources in integrations.items()
-    ]
+    return list(_SUPPLIER_INTEGRATIONS)
 
 
 @router.get("/integrations/{provider}/{resource}")
@@ -144,8 +147,16 @@ def integration_inventory(
     query: Optional[str] = Query(None, description="Filter keyword such as city or code"),
 ) -> List[dict[str, str]]:
     """Return sample inventory payloads for external APIs to support itinerary planning."""
+    provider = provider.lower()
+    resource = resource.lower()
     try:
-        return fetch_supplier_inventory(provider=provider, resource=resource, query=query)
+        # Provider inventory barely moves within a planning session, so
+        # repeated lookups share one result.
+        return cache.get_or_load(
+            f"{cache.SUPPLIER_INVENTORY_KEY_PREFIX}{provider}:{resource}:{query or ''}",
+            lambda: fetch_supplier_inventory(provider=provider, resource=resource, query=query),
+            ttl=cache.SUPPLIER_INVENTORY_TTL_SECONDS,
+        )
     except ValueError as exc:  # surface validation issues as 400s
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -6,7 +6,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from ... import crud, models, schemas
+from ... import cache, crud, models, schemas
 from ..deps import get_db
 
 router = APIRouter(prefix="/packages", tags=["inventory"])
@@ -19,9 +19,19 @@ def create_package(
     return crud.create_tour_package(db, package_in)
 
 
-@router.get("", response_model=List[schemas.TourPackage])
-def list_packages(db: Session = Depends(get_db)) -> List[models.TourPackage]:
-    return list(crud.list_tour_packages(db))
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": List[schemas.TourPackage]}},
+)
+def list_packages(db: Session = Depends(get_db)) -> List[schemas.TourPackage]:
+    return cache.get_or_load(
+        cache.TOUR_PACKAGES_KEY,
+        lambda: [
+            schemas.TourPackage.model_validate(package)
+            for package in crud.list_tour_packages(db)
+        ],
+    )
 
 
 @router.put("/{package_id}", response_model=schemas.TourPackage)
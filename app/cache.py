@@ -0,0 +1,85 @@
+"""In-process caching for rarely changing, read-heavy payloads."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+DEFAULT_TTL_SECONDS = 300
+MAX_ENTRIES = 1024
+LANDING_PAGE_KEY = "admin:landing"
+SITE_SETTINGS_KEY = "admin:settings"
+SUBSCRIPTION_PACKAGES_KEY = "admin:packages"
+SUPPLIERS_KEY = "suppliers:list"
+TOUR_PACKAGES_KEY = "packages:list"
+FLIGHT_SEARCH_KEY_PREFIX = "flights:search:"
+FLIGHT_SEARCH_TTL_SECONDS = 60
+SUPPLIER_INVENTORY_KEY_PREFIX = "suppliers:inventory:"
+SUPPLIER_INVENTORY_TTL_SECONDS = 1800
+
+_PENDING_INVALIDATIONS = "cache_invalidations"
+# Cached routes run both on the event loop and in threadpool workers, so every
+# access to the shared map goes through the lock.
+_lock = threading.Lock()
+_entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+
+def get_or_load(key: str, loader: Callable[[], T], ttl: int = DEFAULT_TTL_SECONDS) -> T:
+    """Return the cached value for ``key`` or populate it from ``loader``.
+
+    Once ``MAX_ENTRIES`` is reached the least recently used entry is evicted,
+    so a burst of request-keyed entries cannot flush the hot admin payloads.
+    """
+
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] > now:
+            _entries.move_to_end(key)
+            return entry[1]
+    # The loader runs outside the lock so slow loads do not serialize readers.
+    value = loader()
+    with _lock:
+        _entries[key] = (now + ttl, value)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return value
+
+
+def invalidate(*keys: str) -> None:
+    with _lock:
+        for key in keys:
+            _entries.pop(key, None)
+
+
+def invalidate_on_commit(session: Session, *keys: str) -> None:
+    """Drop ``keys`` now and again once ``session`` commits.
+
+    The second pass discards values that concurrent readers loaded before the
+    write became visible.
+    """
+
+    invalidate(*keys)
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(keys)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    invalidate(*session.info.pop(_PENDING_INVALIDATIONS, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -1,16 +1,22 @@
 """Application-wide constants and defaults."""
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 APP_NAME = "Tour Planner"
 
-DEFAULT_LANDING_PAGE: dict[str, object] = {
-    "headline": "Build unforgettable journeys with confidence",
-    "subheadline": "Streamline itineraries, finances, and supplier management in one dashboard.",
-    "call_to_action": "Start planning now",
-    "seo_description": "Tour itinerary builder software for travel agencies with CRM, finance, and supplier marketplace.",
-    "hero_image_url": "https://example.com/hero.jpg",
-    "meta_keywords": ["tour planner", "travel agency software", "itinerary builder"],
-}
+# Read-only so the shared defaults cannot be mutated by a request handler.
+DEFAULT_LANDING_PAGE: Mapping[str, object] = MappingProxyType(
+    {
+        "headline": "Build unforgettable journeys with confidence",
+        "subheadline": "Streamline itineraries, finances, and supplier management in one dashboard.",
+        "call_to_action": "Start planning now",
+        "seo_description": "Tour itinerary builder software for travel agencies with CRM, finance, and supplier marketplace.",
+        "hero_image_url": "https://example.com/hero.jpg",
+        "meta_keywords": ("tour planner", "travel agency software", "itinerary builder"),
+    }
+)
 
 LANDING_PAGE_TEXT_FIELDS: tuple[str, ...] = (
     "headline",
@@ -22,6 +28,13 @@ LANDING_PAGE_TEXT_FIELDS: tuple[str, ...] = (
 
 DEFAULT_POWERED_BY_LABEL = f"Powered by {APP_NAME}"
 
+# Printable documents are per-user and change rarely, so browsers may reuse
+# a render briefly instead of asking for it again.
+PRINTABLE_CACHE_CONTROL = "private, max-age=60"
+
+# Upper bound on tags per media asset, after blanks are discarded.
+MAX_MEDIA_TAGS = 32
+
 USER_ROLES: tuple[str, ...] = (
     "super_admin",
     "agency_owner",
@@ -38,4 +51,4 @@ ASSIGNABLE_AGENCY_ROLES: tuple[str, ...] = tuple(
     role for role in USER_ROLES if role != "super_admin"
 )
 
-ADMIN_ROLES: tuple[str, ...] = ("agency_owner", "agency_manager", "super_admin")
+ADMIN_ROLES: frozenset[str] = frozenset({"agency_owner", "agency_manager", "super_admin"})
@@ -1,22 +1,23 @@
 """CRUD helper functions used by the API routers."""
 from __future__ import annotations
 
-import json
 import re
 import secrets
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from itertools import chain
 from typing import Any, Dict, Optional
 
 import string
 
+import orjson
 import pyotp
 from passlib.context import CryptContext
-from sqlalchemy import desc, func, select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, bindparam, desc, exists, extract, func, or_, select, true, tuple_
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 
-from . import models, schemas, utils
+from . import cache, models, schemas, utils
 from .constants import (
     ADMIN_ROLES,
     APP_NAME,
@@ -36,33 +37,49 @@ from sqlalchemy.orm import Session, selectinload
 from . import models, schemas, utils
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+_PNR_ALPHABET = "".join(ch for ch in string.ascii_uppercase if ch not in {"O", "I"})
+_PNR_CANDIDATES_PER_QUERY = 8
+_ZERO = Decimal("0")
+_CENT = Decimal("0.01")
+_HUNDRED = Decimal("100")
+_EMPTY_CONTEXT = "{}"
+
+# Hot statements built once; their compiled form is reused from the engine cache.
+_USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+_AGENCIES_BY_NAME = select(models.TravelAgency).order_by(models.TravelAgency.name)
 
 
 def _slugify(value: str) -> str:
-    value = value.lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
-    value = re.sub(r"-+", "-", value)
+    # One pass suffices: each run of separators, dashes included, becomes one dash.
+    value = _SLUG_SEPARATORS.sub("-", value.lower())
     return value.strip("-") or secrets.token_hex(4)
 
 
-def _ensure_unique_slug(session: Session, slug: str) -> str:
-    base = slug
+def _next_free_slug(session: Session, slug_column: Any, slug: str) -> str:
+    """Return ``slug``, or ``slug-N`` with the lowest free N, in one query."""
+
+    taken = set(
+        session.scalars(
+            select(slug_column).where(
+                or_(slug_column == slug, slug_column.startswith(f"{slug}-", autoescape=True))
+            )
+        )
+    )
+    candidate = slug
     counter = 1
-    while session.scalar(select(models.TravelAgency).where(models.TravelAgency.slug == slug)):
-        slug = f"{base}-{counter}"
+    while candidate in taken:
+        candidate = f"{slug}-{counter}"
         counter += 1
-    return slug
+    return candidate
+
+
+def _ensure_unique_slug(session: Session, slug: str) -> str:
+    return _next_free_slug(session, models.TravelAgency.slug, slug)
 
 
 def _ensure_package_slug(session: Session, slug: str) -> str:
-    base = slug
-    counter = 1
-    while session.scalar(
-        select(models.SubscriptionPackage).where(models.SubscriptionPackage.slug == slug)
-    ):
-        slug = f"{base}-{counter}"
-        counter += 1
-    return slug
+    return _next_free_slug(session, models.SubscriptionPackage.slug, slug)
 
 
 def _coerce_powered_by_label(name: str, label: Optional[str]) -> str:
@@ -78,10 +95,8 @@ def _coerce_powered_by_label(name: str, label: Optional[str]) -> str:
 def _prepare_tags(tags: Optional[list[str] | str]) -> str | None:
     if tags is None:
         return None
-    if isinstance(tags, str):
-        values = [piece.strip() for piece in tags.split(",") if piece.strip()]
-    else:
-        values = [str(tag).strip() for tag in tags if str(tag).strip()]
+    pieces = tags.split(",") if isinstance(tags, str) else map(str, tags)
+    values = [value for value in map(str.strip, pieces) if value]
     return ",".join(values) if values else None
 
 
@@ -92,15 +107,9 @@ def _prepare_features(features: Optional[list[str] | str]) -> str | None:
 def _prepare_modules(modules: Optional[list[str] | str]) -> list[str]:
     if modules is None:
         return ["core"]
-    if isinstance(modules, str):
-        values = [piece.strip().lower() for piece in modules.split(",") if piece.strip()]
-    else:
-        values = [str(module).strip().lower() for module in modules if str(module).strip()]
-    normalized: list[str] = []
-    for value in values or ["core"]:
-        if value and value not in normalized:
-            normalized.append(value)
-    return normalized or ["core"]
+    pieces = modules.split(",") if isinstance(modules, str) else map(str, modules)
+    normalized = dict.fromkeys(value.lower() for value in map(str.strip, pieces) if value)
+    return list(normalized) or ["core"]
 
 
 def _media_assets_by_ids(
@@ -109,19 +118,28 @@ def _media_assets_by_ids(
     if not asset_ids:
         return {}
     statement = select(models.MediaAsset).where(models.MediaAsset.id.in_(asset_ids))
-    assets = session.scalars(statement).unique().all()
+    assets = session.scalars(statement).all()
     return {asset.id: asset for asset in assets}
 
 
 def _generate_unique_pnr(session: Session) -> str:
-    alphabet = "".join(ch for ch in string.ascii_uppercase if ch not in {"O", "I"})
     while True:
-        candidate = "".join(secrets.choice(alphabet) for _ in range(6))
-        exists = session.scalar(
-            select(models.FlightBooking).where(models.FlightBooking.pnr == candidate)
+        candidates = [
+            "".join(secrets.choice(_PNR_ALPHABET) for _ in range(6))
+            for _ in range(_PNR_CANDIDATES_PER_QUERY)
+        ]
+        taken = set(
+            session.scalars(
+                select(models.FlightBooking.pnr).where(models.FlightBooking.pnr.in_(candidates))
+            )
         )
-        if not exists:
-            return candidate
+        for candidate in candidates:
+            if candidate not in taken:
+                return candidate
+
+
+def _dump_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+    return orjson.dumps(metadata).decode() if metadata else _EMPTY_CONTEXT
 
 
 def _notify_contact(
@@ -135,8 +153,7 @@ def _notify_contact(
     metadata: Optional[Dict[str, Any]] = None,
     user: Optional[models.User] = None,
 ) -> None:
-    metadata_json = json.dumps(metadata or {})
-    created = False
+    metadata_json = _dump_metadata(metadata)
     if email:
         session.add(
             models.NotificationLog(
@@ -149,7 +166,6 @@ def _notify_contact(
                 user=user,
             )
         )
-        created = True
     if phone:
         session.add(
             models.NotificationLog(
@@ -162,9 +178,6 @@ def _notify_contact(
                 user=user,
             )
         )
-        created = True
-    if created:
-        session.flush()
 
 
 def log_notification(
@@ -178,6 +191,7 @@ def log_notification(
     status: str = "queued",
     metadata: Optional[Dict[str, Any]] = None,
     user: Optional[models.User] = None,
+    flush: bool = True,
 ) -> models.NotificationLog:
     notification = models.NotificationLog(
         event_type=event_type,
@@ -186,14 +200,53 @@ def log_notification(
         subject=subject,
         message=message,
         status=status,
-        context=json.dumps(metadata or {}),
+        context=_dump_metadata(metadata),
         user=user,
     )
     session.add(notification)
-    session.flush()
+    if flush:
+        session.flush()
     return notification
 
 
+def get_updated_at(session: Session, model: Any, row_id: int) -> datetime | None:
+    """Read only a row's ``updated_at`` column, e.g. to answer conditional GETs."""
+
+    return session.scalar(select(model.updated_at).where(model.id == row_id))
+
+
+def _keyset_page(
+    session: Session,
+    statement: Any,
+    sort_column: Any,
+    id_column: Any,
+    *,
+    descending: bool,
+    after: tuple[Any, int] | None,
+    limit: int,
+) -> tuple[list[Any], tuple[Any, int] | None]:
+    """Fetch one page ordered by ``(sort_column, id_column)``.
+
+    ``after`` is the key of the last row on the previous page. One extra row
+    is requested to tell whether another page follows; the returned key is
+    ``None`` on the last page.
+    """
+
+    key = tuple_(sort_column, id_column)
+    if after is not None:
+        statement = statement.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column, id_column)
+    rows = list(session.scalars(statement.limit(limit + 1)))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (getattr(last, sort_column.key), last.id)
+
+
 # Travel agency helpers
 
 
@@ -220,8 +273,7 @@ def create_travel_agency(session: Session, agency_in: schemas.TravelAgencyCreate
 
 
 def list_travel_agencies(session: Session) -> Sequence[models.TravelAgency]:
-    statement = select(models.TravelAgency).order_by(models.TravelAgency.name)
-    return session.scalars(statement).all()
+    return session.scalars(_AGENCIES_BY_NAME).all()
 
 
 def get_travel_agency(session: Session, agency_id: int) -> models.TravelAgency | None:
@@ -262,6 +314,7 @@ def create_subscription_package(
     package = models.SubscriptionPackage(**data)
     session.add(package)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SUBSCRIPTION_PACKAGES_KEY)
     return package
 
 
@@ -271,7 +324,7 @@ def list_subscription_packages(
     statement = select(models.SubscriptionPackage).order_by(models.SubscriptionPackage.price)
     if only_active:
         statement = statement.where(models.SubscriptionPackage.is_active.is_(True))
-    return session.scalars(statement).unique().all()
+    return session.scalars(statement).all()
 
 
 def get_subscription_package(
@@ -300,6 +353,7 @@ def update_subscription_package(
         setattr(package, field, value)
     session.add(package)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SUBSCRIPTION_PACKAGES_KEY)
     return package
 
 
@@ -313,40 +367,132 @@ def list_agency_subscriptions(
     if agency_id is not None:
         statement = statement.where(models.AgencySubscription.agency_id == agency_id)
     statement = statement.order_by(models.AgencySubscription.created_at.desc())
-    return session.scalars(statement).unique().all()
+    return session.scalars(statement).all()
+
+
+def iter_agency_subscriptions(
+    session: Session, *, agency_id: int | None = None, batch_size: int = 500
+) -> Iterator[models.AgencySubscription]:
+    statement = select(models.AgencySubscription).options(
+        selectinload(models.AgencySubscription.package),
+        selectinload(models.AgencySubscription.agency),
+    )
+    if agency_id is not None:
+        statement = statement.where(models.AgencySubscription.agency_id == agency_id)
+    statement = statement.order_by(models.AgencySubscription.created_at.desc())
+    return iter(session.scalars(statement.execution_options(yield_per=batch_size)))
 
 
 def agency_has_module(session: Session, agency_id: int, module: str) -> bool:
     desired = module.lower()
     statement = (
-        select(models.AgencySubscription)
-        .options(selectinload(models.AgencySubscription.package))
+        select(models.SubscriptionPackage.modules)
+        .join(
+            models.AgencySubscription,
+            models.AgencySubscription.package_id == models.SubscriptionPackage.id,
+        )
         .where(
             models.AgencySubscription.agency_id == agency_id,
             models.AgencySubscription.status == "active",
         )
     )
-    for subscription in session.scalars(statement).unique().all():
-        package = subscription.package
-        modules = (package.modules if package and package.modules is not None else [])
-        normalized = [str(value).lower() for value in modules]
-        if desired in normalized:
-            return True
-    return False
+    return any(
+        desired in (str(value).lower() for value in modules or [])
+        for modules in session.scalars(statement)
+    )
+
+
+def validate_booking_refs(
+    session: Session,
+    *,
+    agency_id: int,
+    client_id: int | None,
+    itinerary_id: int | None,
+    module: str,
+) -> tuple[bool, bool, bool, bool]:
+    """Check a booking's references and the agency's module access in one query.
+
+    Returns ``(agency_found, client_found, itinerary_found, has_module)``;
+    references that were not supplied count as found.
+    """
+
+    client_found = (
+        exists().where(models.Client.id == client_id) if client_id else true()
+    )
+    itinerary_found = (
+        exists().where(models.Itinerary.id == itinerary_id) if itinerary_id else true()
+    )
+    statement = (
+        select(client_found, itinerary_found, models.SubscriptionPackage.modules)
+        .select_from(models.TravelAgency)
+        .outerjoin(
+            models.AgencySubscription,
+            and_(
+                models.AgencySubscription.agency_id == models.TravelAgency.id,
+                models.AgencySubscription.status == "active",
+            ),
+        )
+        .outerjoin(
+            models.SubscriptionPackage,
+            models.SubscriptionPackage.id == models.AgencySubscription.package_id,
+        )
+        .where(models.TravelAgency.id == agency_id)
+    )
+    rows = session.execute(statement).all()
+    if not rows:
+        return False, False, False, False
+    desired = module.lower()
+    has_module = any(
+        desired in (str(value).lower() for value in modules or [])
+        for _, _, modules in rows
+    )
+    return True, bool(rows[0][0]), bool(rows[0][1]), has_module
+
+
+def check_agency_and_package_exist(
+    session: Session, agency_id: int, package_id: int
+) -> tuple[bool, bool]:
+    statement = select(
+        exists().where(models.TravelAgency.id == agency_id),
+        exists().where(models.SubscriptionPackage.id == package_id),
+    )
+    agency_exists, package_exists = session.execute(statement).one()
+    return bool(agency_exists), bool(package_exists)
 
 
 def get_agency_subscription(
     session: Session, subscription_id: int
 ) -> models.AgencySubscription | None:
-    statement = (
-        select(models.AgencySubscription)
-        .options(
+    return session.get(
+        models.AgencySubscription,
+        subscription_id,
+        options=[
             selectinload(models.AgencySubscription.package),
             selectinload(models.AgencySubscription.agency),
-        )
-        .where(models.AgencySubscription.id == subscription_id)
+        ],
+    )
+
+
+def _subscription_parties(
+    session: Session, subscription: models.AgencySubscription
+) -> tuple[str, str, str | None, str | None] | None:
+    """Return the agency name, package name and agency contacts in one query."""
+
+    package_name = (
+        select(models.SubscriptionPackage.name)
+        .where(models.SubscriptionPackage.id == subscription.package_id)
+        .scalar_subquery()
     )
-    return session.scalars(statement).unique().first()
+    statement = select(
+        models.TravelAgency.name,
+        package_name,
+        models.TravelAgency.contact_email,
+        models.TravelAgency.contact_phone,
+    ).where(models.TravelAgency.id == subscription.agency_id)
+    row = session.execute(statement).first()
+    if row is None or row[1] is None:
+        return None
+    return row
 
 
 def create_agency_subscription(
@@ -358,16 +504,16 @@ def create_agency_subscription(
     subscription = models.AgencySubscription(**data)
     session.add(subscription)
     session.flush()
-    agency = session.get(models.TravelAgency, subscription.agency_id)
-    package = session.get(models.SubscriptionPackage, subscription.package_id)
-    if agency and package:
+    parties = _subscription_parties(session, subscription)
+    if parties:
+        agency_name, package_name, email, phone = parties
         _notify_contact(
             session,
             "subscription.created",
             subject="Subscription activated",
-            message=f"{agency.name} subscribed to {package.name}.",
-            email=agency.contact_email,
-            phone=agency.contact_phone,
+            message=f"{agency_name} subscribed to {package_name}.",
+            email=email,
+            phone=phone,
             metadata={
                 "agency_id": subscription.agency_id,
                 "package_id": subscription.package_id,
@@ -387,16 +533,16 @@ def update_agency_subscription(
         setattr(subscription, field, value)
     session.add(subscription)
     session.flush()
-    agency = session.get(models.TravelAgency, subscription.agency_id)
-    package = session.get(models.SubscriptionPackage, subscription.package_id)
-    if agency and package:
+    parties = _subscription_parties(session, subscription)
+    if parties:
+        agency_name, _, email, phone = parties
         _notify_contact(
             session,
             "subscription.updated",
             subject="Subscription updated",
-            message=f"Subscription for {agency.name} now {subscription.status}.",
-            email=agency.contact_email,
-            phone=agency.contact_phone,
+            message=f"Subscription for {agency_name} now {subscription.status}.",
+            email=email,
+            phone=phone,
             metadata={
                 "agency_id": subscription.agency_id,
                 "package_id": subscription.package_id,
@@ -442,14 +588,27 @@ def create_media_asset(
     return asset
 
 
-def list_media_assets(session: Session) -> Sequence[models.MediaAsset]:
+def list_media_assets_page(
+    session: Session, *, after: tuple[datetime, int] | None = None, limit: int = 50
+) -> tuple[list[models.MediaAsset], tuple[datetime, int] | None]:
+    return _keyset_page(
+        session,
+        select(models.MediaAsset),
+        models.MediaAsset.created_at,
+        models.MediaAsset.id,
+        descending=True,
+        after=after,
+        limit=limit,
+    )
+
+
+def iter_media_assets(session: Session, *, batch_size: int = 500) -> Iterator[models.MediaAsset]:
     statement = select(models.MediaAsset).order_by(models.MediaAsset.created_at.desc())
-    return session.scalars(statement).unique().all()
+    return iter(session.scalars(statement.execution_options(yield_per=batch_size)))
 
 
 def get_media_asset(session: Session, asset_id: int) -> models.MediaAsset | None:
-    statement = select(models.MediaAsset).where(models.MediaAsset.id == asset_id)
-    return session.scalars(statement).unique().first()
+    return session.get(models.MediaAsset, asset_id)
 
 
 def update_media_asset(
@@ -469,7 +628,6 @@ def update_media_asset(
 def delete_media_asset(session: Session, asset: models.MediaAsset) -> None:
     utils.remove_media_files(asset)
     session.delete(asset)
-    session.flush()
 
 
 # User helpers
@@ -497,7 +655,6 @@ def create_user(session: Session, user_in: schemas.UserCreate) -> models.User:
         is_admin=is_admin,
         is_super_admin=is_super_admin,
         role=role,
-        is_admin=user_in.is_admin,
     )
     session.add(user)
     session.flush()
@@ -519,7 +676,13 @@ def get_user(session: Session, user_id: int) -> models.User | None:
 
 
 def get_user_by_email(session: Session, email: str) -> models.User | None:
-    statement = select(models.User).where(models.User.email == email)
+    return session.scalars(_USER_BY_EMAIL, {"email": email}).first()
+
+
+def get_agency_user(session: Session, agency_id: int, user_id: int) -> models.User | None:
+    statement = select(models.User).where(
+        models.User.id == user_id, models.User.agency_id == agency_id
+    )
     return session.scalars(statement).first()
 
 
@@ -560,7 +723,6 @@ def update_user(session: Session, user: models.User, user_in: schemas.UserUpdate
 
 def delete_user(session: Session, user: models.User) -> None:
     session.delete(user)
-    session.flush()
 
 
 def authenticate_user(
@@ -595,6 +757,7 @@ def initiate_two_factor(session: Session, user: models.User) -> tuple[str, str]:
         message="Use the provided secret to configure your authenticator app.",
         metadata={"user_id": user.id},
         user=user,
+        flush=False,
     )
     return secret, provisioning_uri
 
@@ -647,9 +810,33 @@ def create_client(session: Session, client_in: schemas.ClientCreate) -> models.C
     return client
 
 
-def list_clients(session: Session) -> Sequence[models.Client]:
-    statement = select(models.Client).order_by(models.Client.name)
-    return session.scalars(statement).all()
+def list_clients_page(
+    session: Session,
+    *,
+    search: str | None = None,
+    after: tuple[str, int] | None = None,
+    limit: int = 50,
+) -> tuple[list[models.Client], tuple[str, int] | None]:
+    statement = select(models.Client)
+    if search:
+        # Unanchored matches can only use an index built for them, e.g. on
+        # PostgreSQL: CREATE INDEX clients_name_trgm ON clients
+        # USING gin (name gin_trgm_ops) (and likewise for email).
+        statement = statement.where(
+            or_(
+                models.Client.name.icontains(search, autoescape=True),
+                models.Client.email.icontains(search, autoescape=True),
+            )
+        )
+    return _keyset_page(
+        session,
+        statement,
+        models.Client.name,
+        models.Client.id,
+        descending=False,
+        after=after,
+        limit=limit,
+    )
 
 
 def get_client(session: Session, client_id: int) -> models.Client | None:
@@ -675,7 +862,6 @@ def update_client(session: Session, client: models.Client, client_in: schemas.Cl
 
 def delete_client(session: Session, client: models.Client) -> None:
     session.delete(client)
-    session.flush()
 
 
 # Lead helpers
@@ -696,9 +882,18 @@ def create_lead(session: Session, lead_in: schemas.LeadCreate) -> models.Lead:
     return lead
 
 
-def list_leads(session: Session) -> Sequence[models.Lead]:
-    statement = select(models.Lead).order_by(models.Lead.created_at.desc())
-    return session.scalars(statement).all()
+def list_leads_page(
+    session: Session, *, after: tuple[datetime, int] | None = None, limit: int = 50
+) -> tuple[list[models.Lead], tuple[datetime, int] | None]:
+    return _keyset_page(
+        session,
+        select(models.Lead),
+        models.Lead.created_at,
+        models.Lead.id,
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
 
 def get_lead(session: Session, lead_id: int) -> models.Lead | None:
@@ -715,7 +910,6 @@ def update_lead(session: Session, lead: models.Lead, lead_in: schemas.LeadUpdate
 
 def delete_lead(session: Session, lead: models.Lead) -> None:
     session.delete(lead)
-    session.flush()
 
 
 def convert_lead_to_client(session: Session, lead: models.Lead) -> models.Client:
@@ -729,12 +923,9 @@ def convert_lead_to_client(session: Session, lead: models.Lead) -> models.Client
         "agency_id": lead.agency_id,
     }
     client = models.Client(**{key: value for key, value in client_data.items() if value is not None})
-    session.add(client)
-    session.flush()
-
-    lead.client_id = client.id
+    lead.client = client
     lead.status = "converted"
-    session.add(lead)
+    session.add(client)
     session.flush()
 
     _notify_contact(
@@ -755,6 +946,7 @@ def create_tour_package(session: Session, package_in: schemas.TourPackageCreate)
     package = models.TourPackage(**package_in.model_dump())
     session.add(package)
     session.flush()
+    cache.invalidate_on_commit(session, cache.TOUR_PACKAGES_KEY)
     return package
 
 
@@ -774,63 +966,62 @@ def update_tour_package(
         setattr(package, field, value)
     session.add(package)
     session.flush()
+    cache.invalidate_on_commit(session, cache.TOUR_PACKAGES_KEY)
     return package
 
 
 def delete_tour_package(session: Session, package: models.TourPackage) -> None:
     session.delete(package)
-    session.flush()
+    cache.invalidate_on_commit(session, cache.TOUR_PACKAGES_KEY)
 
 
 # Itinerary helpers
 
 
 def _calculate_itinerary_cost(itinerary: models.Itinerary) -> Decimal:
-    total = Decimal("0")
-    for item in itinerary.items:
-        if item.estimated_cost is not None:
-            total += Decimal(item.estimated_cost)
-    for extension in itinerary.extensions:
-        if extension.additional_cost is not None:
-            total += Decimal(extension.additional_cost)
-    return total
+    costs = chain(
+        (item.estimated_cost for item in itinerary.items),
+        (extension.additional_cost for extension in itinerary.extensions),
+    )
+    return sum((Decimal(cost) for cost in costs if cost is not None), _ZERO)
 
 
 def _apply_pricing_strategy(itinerary: models.Itinerary) -> None:
     base_cost = _calculate_itinerary_cost(itinerary)
     strategy = (itinerary.markup_strategy or "flat").lower()
-    target = itinerary.target_margin or Decimal("0")
+    target = itinerary.target_margin or _ZERO
     if not isinstance(target, Decimal):
         target = Decimal(str(target))
 
-    markup_value = Decimal("0")
+    markup_value = _ZERO
     if strategy == "percentage":
-        markup_value = (base_cost * target / Decimal("100")).quantize(Decimal("0.01"))
+        markup_value = (base_cost * target / _HUNDRED).quantize(_CENT)
     else:
-        markup_value = Decimal(target).quantize(Decimal("0.01")) if target else Decimal("0")
+        markup_value = Decimal(target).quantize(_CENT) if target else _ZERO
 
     if itinerary.total_price is None or itinerary.total_price < base_cost:
-        itinerary.total_price = (base_cost + markup_value).quantize(Decimal("0.01"))
+        itinerary.total_price = (base_cost + markup_value).quantize(_CENT)
 
-    itinerary.calculated_margin = (Decimal(itinerary.total_price or 0) - base_cost).quantize(
-        Decimal("0.01")
-    )
+    itinerary.calculated_margin = (Decimal(itinerary.total_price or 0) - base_cost).quantize(_CENT)
 
     if itinerary.estimate_amount is None and itinerary.total_price is not None:
         itinerary.estimate_amount = itinerary.total_price
 
 
-def get_pricing_summary(itinerary: models.Itinerary) -> schemas.PricingSummary:
-    base_cost = _calculate_itinerary_cost(itinerary)
+def get_pricing_summary(
+    itinerary: models.Itinerary, base_cost: Decimal | None = None
+) -> schemas.PricingSummary:
+    if base_cost is None:
+        base_cost = _calculate_itinerary_cost(itinerary)
     total_price = Decimal(itinerary.total_price or itinerary.estimate_amount or 0)
     markup_value = total_price - base_cost
     margin_percent = float(0)
     if base_cost:
-        margin_percent = float((markup_value / base_cost) * Decimal("100"))
+        margin_percent = float((markup_value / base_cost) * _HUNDRED)
     return schemas.PricingSummary(
-        base_cost=base_cost.quantize(Decimal("0.01")),
-        markup_value=markup_value.quantize(Decimal("0.01")),
-        total_price=total_price.quantize(Decimal("0.01")) if total_price else Decimal("0.00"),
+        base_cost=base_cost.quantize(_CENT),
+        markup_value=markup_value.quantize(_CENT),
+        total_price=total_price.quantize(_CENT) if total_price else Decimal("0.00"),
         margin_percent=round(margin_percent, 2),
     )
 
@@ -903,44 +1094,39 @@ def create_itinerary(session: Session, itinerary_in: schemas.ItineraryCreate) ->
         phone=client.phone if client else None,
         metadata={"itinerary_id": itinerary.id},
     )
-def create_itinerary(session: Session, itinerary_in: schemas.ItineraryCreate) -> models.Itinerary:
-    items_data = itinerary_in.model_dump().pop("items", [])
-    itinerary = models.Itinerary(**itinerary_in.model_dump(exclude={"items"}))
-    session.add(itinerary)
-    session.flush()
-
-    for item in items_data:
-        itinerary_item = models.ItineraryItem(itinerary_id=itinerary.id, **item)
-        session.add(itinerary_item)
-    session.flush()
     return itinerary
 
 
-def list_itineraries(session: Session) -> Sequence[models.Itinerary]:
-    statement = (
-        select(models.Itinerary)
-        .options(
-            selectinload(models.Itinerary.items)
-            .selectinload(models.ItineraryItem.media_links)
-            .selectinload(models.ItineraryItemMedia.asset),
-            selectinload(models.Itinerary.client),
-            selectinload(models.Itinerary.tour_package),
-            selectinload(models.Itinerary.extensions),
-            selectinload(models.Itinerary.notes),
-            selectinload(models.Itinerary.collaborators).selectinload(
-                models.ItineraryCollaborator.user
-            ),
-            selectinload(models.Itinerary.comments).selectinload(
-                models.ItineraryComment.author
-            ),
-            selectinload(models.Itinerary.versions),
-            selectinload(models.Itinerary.items),
-            selectinload(models.Itinerary.client),
-            selectinload(models.Itinerary.tour_package),
-        )
-        .order_by(models.Itinerary.start_date)
+_ITINERARY_GRAPH_OPTIONS = (
+    selectinload(models.Itinerary.items)
+    .selectinload(models.ItineraryItem.media_links)
+    .selectinload(models.ItineraryItemMedia.asset),
+    joinedload(models.Itinerary.client),
+    joinedload(models.Itinerary.tour_package),
+    selectinload(models.Itinerary.extensions),
+    selectinload(models.Itinerary.notes),
+    selectinload(models.Itinerary.collaborators).selectinload(models.ItineraryCollaborator.user),
+    selectinload(models.Itinerary.comments).selectinload(models.ItineraryComment.author),
+    selectinload(models.Itinerary.versions),
+)
+
+
+def _itinerary_list_statement() -> Any:
+    return select(models.Itinerary).options(*_ITINERARY_GRAPH_OPTIONS)
+
+
+def list_itineraries_page(
+    session: Session, *, after: tuple[date, int] | None = None, limit: int = 50
+) -> tuple[list[models.Itinerary], tuple[date, int] | None]:
+    return _keyset_page(
+        session,
+        _itinerary_list_statement(),
+        models.Itinerary.start_date,
+        models.Itinerary.id,
+        descending=False,
+        after=after,
+        limit=limit,
     )
-    return session.scalars(statement).unique().all()
 
 
 def get_itinerary(session: Session, itinerary_id: int) -> models.Itinerary | None:
@@ -948,74 +1134,125 @@ def get_itinerary(session: Session, itinerary_id: int) -> models.Itinerary | Non
         select(models.Itinerary)
         .where(models.Itinerary.id == itinerary_id)
         .options(
-            selectinload(models.Itinerary.items)
-            .selectinload(models.ItineraryItem.media_links)
-            .selectinload(models.ItineraryItemMedia.asset),
-            selectinload(models.Itinerary.client),
-            selectinload(models.Itinerary.tour_package),
-            selectinload(models.Itinerary.extensions),
-            selectinload(models.Itinerary.notes),
-            selectinload(models.Itinerary.collaborators).selectinload(
-                models.ItineraryCollaborator.user
-            ),
-            selectinload(models.Itinerary.comments).selectinload(
-                models.ItineraryComment.author
-            ),
-            selectinload(models.Itinerary.versions),
+            *_ITINERARY_GRAPH_OPTIONS,
+            # The agency feeds the branding block of printed documents.
+            joinedload(models.Itinerary.client).joinedload(models.Client.agency),
             selectinload(models.Itinerary.portal_tokens),
-            selectinload(models.Itinerary.items),
-            selectinload(models.Itinerary.client),
-            selectinload(models.Itinerary.tour_package),
         )
     )
-    return session.scalars(statement).unique().first()
+    return session.scalars(statement).first()
+
+
+def get_itinerary_with_cost(
+    session: Session, itinerary_id: int
+) -> tuple[models.Itinerary, Decimal] | None:
+    """Load an itinerary row with its item and extension costs summed in SQL."""
+
+    item_cost = (
+        select(func.coalesce(func.sum(models.ItineraryItem.estimated_cost), 0))
+        .where(models.ItineraryItem.itinerary_id == models.Itinerary.id)
+        .scalar_subquery()
+    )
+    extension_cost = (
+        select(func.coalesce(func.sum(models.ItineraryExtension.additional_cost), 0))
+        .where(models.ItineraryExtension.itinerary_id == models.Itinerary.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(models.Itinerary, item_cost + extension_cost)
+        .where(models.Itinerary.id == itinerary_id)
+        .options(raiseload("*"))
+    )
+    row = session.execute(statement).first()
+    return tuple(row) if row else None
+
+
+def _sync_children(collection: list, rows: list[dict], model: type, label: str) -> list:
+    """Reconcile a loaded child collection with ``rows`` keyed by primary key.
+
+    Rows carrying the ``id`` of an existing child update it in place, rows
+    without one are inserted, and children whose id is absent are deleted.
+    """
+
+    existing = {child.id: child for child in collection}
+    row_ids = [row["id"] for row in rows if row.get("id") is not None]
+    if len(set(row_ids)) != len(row_ids):
+        raise ValueError(f"Duplicate {label} ids in payload")
+    unknown_ids = set(row_ids) - existing.keys()
+    if unknown_ids:
+        raise ValueError(f"Unknown {label} ids: {sorted(unknown_ids)}")
+
+    for child_id in existing.keys() - set(row_ids):
+        collection.remove(existing[child_id])
+
+    children = []
+    for row in rows:
+        child_id = row.pop("id", None)
+        if child_id is None:
+            child = model(**row)
+            collection.append(child)
+        else:
+            child = existing[child_id]
+            for field, value in row.items():
+                setattr(child, field, value)
+        children.append(child)
+    return children
+
+
+def _sync_itinerary_items(
+    session: Session, itinerary: models.Itinerary, items_data: list[dict]
+) -> None:
+    asset_ids = {
+        media["asset_id"]
+        for item in items_data
+        for media in item.get("media", [])
+    }
+    asset_map = _media_assets_by_ids(session, list(asset_ids))
+    missing_assets = asset_ids - set(asset_map.keys())
+    if missing_assets:
+        raise ValueError(f"Unknown media asset ids: {sorted(missing_assets)}")
+
+    media_payloads = [item_data.pop("media", []) for item_data in items_data]
+    items = _sync_children(itinerary.items, items_data, models.ItineraryItem, "itinerary item")
+    for itinerary_item, payloads in zip(items, media_payloads):
+        wanted = [(media["asset_id"], media.get("usage", "gallery")) for media in payloads]
+        current = [(link.media_asset_id, link.usage) for link in itinerary_item.media_links]
+        if wanted == current:
+            continue
+        itinerary_item.media_links.clear()
+        for asset_id, usage in wanted:
+            itinerary_item.media_links.append(
+                models.ItineraryItemMedia(asset=asset_map[asset_id], usage=usage)
+            )
 
 
 def update_itinerary(
     session: Session, itinerary: models.Itinerary, itinerary_in: schemas.ItineraryUpdate
 ) -> models.Itinerary:
     data = itinerary_in.model_dump(exclude_unset=True)
-    items_data = data.pop("items", None)
-    extensions_data = data.pop("extensions", None)
-    notes_data = data.pop("notes", None)
+    # exclude_unset also applies to nested rows, so child rows are dumped in
+    # full: fields a row omits fall back to their defaults rather than
+    # keeping the stored value.
+    children = {
+        key: [child.model_dump() for child in getattr(itinerary_in, key)]
+        for key in ("items", "extensions", "notes")
+        if data.pop(key, None) is not None
+    }
 
     for field, value in data.items():
         setattr(itinerary, field, value)
 
-    if items_data is not None:
-        itinerary.items.clear()
-        session.flush()
-        asset_ids = {
-            media["asset_id"]
-            for item in items_data
-            for media in item.get("media", [])
-        }
-        asset_map = _media_assets_by_ids(session, list(asset_ids))
-        missing_assets = asset_ids - set(asset_map.keys())
-        if missing_assets:
-            raise ValueError(f"Unknown media asset ids: {sorted(missing_assets)}")
-        for item_data in items_data:
-            media_payloads = item_data.pop("media", [])
-            itinerary_item = models.ItineraryItem(**item_data)
-            for media_payload in media_payloads:
-                asset = asset_map[media_payload["asset_id"]]
-                itinerary_item.media_links.append(
-                    models.ItineraryItemMedia(
-                        asset=asset,
-                        usage=media_payload.get("usage", "gallery"),
-                    )
-                )
-            itinerary.items.append(itinerary_item)
-
-    if extensions_data is not None:
-        itinerary.extensions.clear()
-        for extension in extensions_data:
-            itinerary.extensions.append(models.ItineraryExtension(**extension))
-
-    if notes_data is not None:
-        itinerary.notes.clear()
-        for note in notes_data:
-            itinerary.notes.append(models.ItineraryNote(**note))
+    if "items" in children:
+        _sync_itinerary_items(session, itinerary, children["items"])
+    if "extensions" in children:
+        _sync_children(
+            itinerary.extensions,
+            children["extensions"],
+            models.ItineraryExtension,
+            "itinerary extension",
+        )
+    if "notes" in children:
+        _sync_children(itinerary.notes, children["notes"], models.ItineraryNote, "itinerary note")
 
     session.add(itinerary)
     session.flush()
@@ -1047,17 +1284,11 @@ def update_itinerary(
         phone=client.phone if client else None,
         metadata={"itinerary_id": itinerary.id},
     )
-        for item in items_data:
-            itinerary.items.append(models.ItineraryItem(**item))
-
-    session.add(itinerary)
-    session.flush()
     return itinerary
 
 
 def delete_itinerary(session: Session, itinerary: models.Itinerary) -> None:
     session.delete(itinerary)
-    session.flush()
 
 
 def duplicate_itinerary(session: Session, itinerary: models.Itinerary) -> models.Itinerary:
@@ -1077,7 +1308,6 @@ def duplicate_itinerary(session: Session, itinerary: models.Itinerary) -> models
         brand_footer_note=itinerary.brand_footer_note,
     )
     session.add(clone)
-    session.flush()
 
     for item in itinerary.items:
         clone_item = models.ItineraryItem(
@@ -1191,6 +1421,16 @@ def create_itinerary_comment(
     return comment
 
 
+def get_itinerary_comment(
+    session: Session, itinerary_id: int, comment_id: int
+) -> models.ItineraryComment | None:
+    statement = select(models.ItineraryComment).where(
+        models.ItineraryComment.id == comment_id,
+        models.ItineraryComment.itinerary_id == itinerary_id,
+    )
+    return session.scalars(statement).first()
+
+
 def set_comment_resolution(
     session: Session, comment: models.ItineraryComment, resolved: bool
 ) -> models.ItineraryComment:
@@ -1263,7 +1503,15 @@ def create_portal_invitation(
     return portal_token
 
 
-def get_portal_token(session: Session, token: str) -> models.PortalAccessToken | None:
+def get_portal_token(
+    session: Session, token: str, *, active_at: datetime | None = None
+) -> models.PortalAccessToken | None:
+    """Load a portal token with the itinerary graph the portal renders.
+
+    When ``active_at`` is given, tokens that expired before it are filtered
+    in SQL so no itinerary data is loaded for them.
+    """
+
     statement = (
         select(models.PortalAccessToken)
         .where(models.PortalAccessToken.token == token)
@@ -1276,20 +1524,28 @@ def get_portal_token(session: Session, token: str) -> models.PortalAccessToken |
             .selectinload(models.Itinerary.notes),
             selectinload(models.PortalAccessToken.itinerary)
             .selectinload(models.Itinerary.extensions),
-            selectinload(models.PortalAccessToken.itinerary).selectinload(
-                models.Itinerary.client
-            ),
+            selectinload(models.PortalAccessToken.itinerary)
+            .selectinload(models.Itinerary.client)
+            .selectinload(models.Client.agency),
         )
     )
+    if active_at is not None:
+        statement = statement.where(models.PortalAccessToken.expires_at >= active_at)
     return session.scalars(statement).first()
 
 
+def portal_token_exists(session: Session, token: str) -> bool:
+    statement = select(exists().where(models.PortalAccessToken.token == token))
+    return bool(session.scalar(statement))
+
+
 def record_portal_view(
     session: Session, portal_token: models.PortalAccessToken
 ) -> models.PortalAccessToken:
+    # Nothing reads the timestamp back from the database, so the UPDATE rides
+    # on the request's commit instead of a flush of its own.
     portal_token.last_viewed_at = datetime.utcnow()
     session.add(portal_token)
-    session.flush()
     return portal_token
 
 
@@ -1335,19 +1591,6 @@ def get_portal_view(portal_token: models.PortalAccessToken) -> schemas.PortalVie
         payment_methods=list(utils.SUPPORTED_PAYMENT_PROVIDERS.keys()),
         branding=branding,
     )
-        session.add(
-            models.ItineraryItem(
-                itinerary_id=clone.id,
-                day_number=item.day_number,
-                title=item.title,
-                description=item.description,
-                location=item.location,
-                start_time=item.start_time,
-                end_time=item.end_time,
-            )
-        )
-    session.flush()
-    return clone
 
 
 # Finance helpers
@@ -1416,13 +1659,18 @@ def create_invoice_from_itinerary(
     return invoice
 
 
-def list_invoices(session: Session) -> Sequence[models.Invoice]:
-    statement = (
-        select(models.Invoice)
-        .options(selectinload(models.Invoice.payments))
-        .order_by(models.Invoice.issue_date.desc())
+def list_invoices_page(
+    session: Session, *, after: tuple[date, int] | None = None, limit: int = 50
+) -> tuple[list[models.Invoice], tuple[date, int] | None]:
+    return _keyset_page(
+        session,
+        select(models.Invoice),
+        models.Invoice.issue_date,
+        models.Invoice.id,
+        descending=True,
+        after=after,
+        limit=limit,
     )
-    return session.scalars(statement).unique().all()
 
 
 def get_invoice(session: Session, invoice_id: int) -> models.Invoice | None:
@@ -1431,7 +1679,7 @@ def get_invoice(session: Session, invoice_id: int) -> models.Invoice | None:
         .where(models.Invoice.id == invoice_id)
         .options(selectinload(models.Invoice.payments))
     )
-    return session.scalars(statement).unique().first()
+    return session.scalars(statement).first()
 
 
 def update_invoice(session: Session, invoice: models.Invoice, invoice_in: schemas.InvoiceUpdate) -> models.Invoice:
@@ -1444,7 +1692,6 @@ def update_invoice(session: Session, invoice: models.Invoice, invoice_in: schema
 
 def delete_invoice(session: Session, invoice: models.Invoice) -> None:
     session.delete(invoice)
-    session.flush()
 
 
 def create_payment(session: Session, payment_in: schemas.PaymentCreate) -> models.Payment:
@@ -1465,9 +1712,18 @@ def create_payment(session: Session, payment_in: schemas.PaymentCreate) -> model
     return payment
 
 
-def list_payments(session: Session) -> Sequence[models.Payment]:
-    statement = select(models.Payment).order_by(models.Payment.paid_on.desc())
-    return session.scalars(statement).all()
+def list_payments_page(
+    session: Session, *, after: tuple[date, int] | None = None, limit: int = 50
+) -> tuple[list[models.Payment], tuple[date, int] | None]:
+    return _keyset_page(
+        session,
+        select(models.Payment),
+        models.Payment.paid_on,
+        models.Payment.id,
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
 
 def get_payment(session: Session, payment_id: int) -> models.Payment | None:
@@ -1484,7 +1740,6 @@ def update_payment(session: Session, payment: models.Payment, payment_in: schema
 
 def delete_payment(session: Session, payment: models.Payment) -> None:
     session.delete(payment)
-    session.flush()
 
 
 def create_payment_gateway(
@@ -1517,7 +1772,6 @@ def update_payment_gateway(
 
 def delete_payment_gateway(session: Session, gateway: models.PaymentGateway) -> None:
     session.delete(gateway)
-    session.flush()
 
 
 def create_expense(session: Session, expense_in: schemas.ExpenseCreate) -> models.Expense:
@@ -1527,9 +1781,18 @@ def create_expense(session: Session, expense_in: schemas.ExpenseCreate) -> model
     return expense
 
 
-def list_expenses(session: Session) -> Sequence[models.Expense]:
-    statement = select(models.Expense).order_by(models.Expense.incurred_on.desc())
-    return session.scalars(statement).all()
+def list_expenses_page(
+    session: Session, *, after: tuple[date, int] | None = None, limit: int = 50
+) -> tuple[list[models.Expense], tuple[date, int] | None]:
+    return _keyset_page(
+        session,
+        select(models.Expense),
+        models.Expense.incurred_on,
+        models.Expense.id,
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
 
 def get_expense(session: Session, expense_id: int) -> models.Expense | None:
@@ -1546,31 +1809,58 @@ def update_expense(session: Session, expense: models.Expense, expense_in: schema
 
 def delete_expense(session: Session, expense: models.Expense) -> None:
     session.delete(expense)
-    session.flush()
-
 
-def sales_report(session: Session) -> dict[str, dict[str, float]]:
-    invoices = list_invoices(session)
-    payments = list_payments(session)
 
-    monthly: dict[str, dict[str, Decimal]] = {}
-    for invoice in invoices:
-        month = invoice.issue_date.strftime("%Y-%m") if invoice.issue_date else "unknown"
-        summary = monthly.setdefault(month, {"invoiced": Decimal("0"), "paid": Decimal("0")})
-        summary["invoiced"] += Decimal(invoice.amount)
-    for payment in payments:
-        month = payment.paid_on.strftime("%Y-%m") if payment.paid_on else "unknown"
-        summary = monthly.setdefault(month, {"invoiced": Decimal("0"), "paid": Decimal("0")})
-        summary["paid"] += Decimal(payment.amount)
+def finance_totals(session: Session) -> dict[str, Decimal]:
+    """Aggregate invoice, completed payment, and expense totals in one query."""
 
+    invoiced = select(func.coalesce(func.sum(models.Invoice.amount), 0)).scalar_subquery()
+    paid = (
+        select(func.coalesce(func.sum(models.Payment.amount), 0))
+        .where(func.lower(models.Payment.status) == "completed")
+        .scalar_subquery()
+    )
+    spent = select(func.coalesce(func.sum(models.Expense.amount), 0)).scalar_subquery()
+    total_invoiced, total_paid, total_expenses = session.execute(
+        select(invoiced, paid, spent)
+    ).one()
     return {
-        "monthly": {
-            month: {"invoiced": float(values["invoiced"]), "paid": float(values["paid"])}
-            for month, values in sorted(monthly.items())
-        }
+        "total_invoiced": Decimal(total_invoiced),
+        "total_paid": Decimal(total_paid),
+        "total_expenses": Decimal(total_expenses),
     }
 
 
+def itinerary_status_counts(session: Session) -> dict[str, int]:
+    """Count itineraries per status with a single grouped query."""
+
+    statement = select(models.Itinerary.status, func.count()).group_by(models.Itinerary.status)
+    return {status: count for status, count in session.execute(statement)}
+
+
+def sales_report(
+    session: Session, *, start: date | None = None, end: date | None = None
+) -> dict[str, dict[str, float]]:
+    monthly: dict[str, dict[str, float]] = {}
+    for key, column, amount in (
+        ("invoiced", models.Invoice.issue_date, models.Invoice.amount),
+        ("paid", models.Payment.paid_on, models.Payment.amount),
+    ):
+        year = extract("year", column)
+        month = extract("month", column)
+        statement = select(year, month, func.sum(amount)).group_by(year, month)
+        if start is not None:
+            statement = statement.where(column >= start)
+        if end is not None:
+            statement = statement.where(column <= end)
+        for year_value, month_value, total in session.execute(statement):
+            label = f"{int(year_value):04d}-{int(month_value):02d}" if year_value else "unknown"
+            summary = monthly.setdefault(label, {"invoiced": 0.0, "paid": 0.0})
+            summary[key] = float(total or 0)
+
+    return {"monthly": dict(sorted(monthly.items()))}
+
+
 # Supplier helpers
 
 
@@ -1578,6 +1868,7 @@ def create_supplier(session: Session, supplier_in: schemas.SupplierCreate) -> mo
     supplier = models.Supplier(**supplier_in.model_dump())
     session.add(supplier)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
     _notify_contact(
         session,
         "supplier.created",
@@ -1594,7 +1885,7 @@ def list_suppliers(session: Session) -> Sequence[models.Supplier]:
     statement = select(models.Supplier).options(selectinload(models.Supplier.rates)).order_by(
         models.Supplier.name
     )
-    return session.scalars(statement).unique().all()
+    return session.scalars(statement).all()
 
 
 def get_supplier(session: Session, supplier_id: int) -> models.Supplier | None:
@@ -1603,7 +1894,7 @@ def get_supplier(session: Session, supplier_id: int) -> models.Supplier | None:
         .where(models.Supplier.id == supplier_id)
         .options(selectinload(models.Supplier.rates))
     )
-    return session.scalars(statement).unique().first()
+    return session.scalars(statement).first()
 
 
 def update_supplier(
@@ -1613,12 +1904,13 @@ def update_supplier(
         setattr(supplier, field, value)
     session.add(supplier)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
     return supplier
 
 
 def delete_supplier(session: Session, supplier: models.Supplier) -> None:
     session.delete(supplier)
-    session.flush()
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
 
 
 def create_supplier_rate(
@@ -1627,6 +1919,8 @@ def create_supplier_rate(
     rate = models.SupplierRate(supplier_id=supplier.id, **rate_in.model_dump())
     session.add(rate)
     session.flush()
+    # Supplier listings embed their rates.
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
     _notify_contact(
         session,
         "supplier.rate_created",
@@ -1661,6 +1955,18 @@ def get_supplier_rate(
     return session.scalars(statement).first()
 
 
+def get_scoped_supplier_rate(
+    session: Session, supplier_id: int, rate_id: int
+) -> models.SupplierRate | None:
+    """Fetch a rate only if it belongs to ``supplier_id``, in one query."""
+
+    statement = select(models.SupplierRate).where(
+        models.SupplierRate.id == rate_id,
+        models.SupplierRate.supplier_id == supplier_id,
+    )
+    return session.scalars(statement).first()
+
+
 def update_supplier_rate(
     session: Session,
     rate: models.SupplierRate,
@@ -1670,12 +1976,13 @@ def update_supplier_rate(
         setattr(rate, field, value)
     session.add(rate)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
     return rate
 
 
 def delete_supplier_rate(session: Session, rate: models.SupplierRate) -> None:
     session.delete(rate)
-    session.flush()
+    cache.invalidate_on_commit(session, cache.SUPPLIERS_KEY)
 
 
 # Integration helpers
@@ -1723,23 +2030,18 @@ def update_integration_credential(
 # Flight booking helpers
 
 
-def list_flight_bookings(
-    session: Session,
+def _flight_bookings_statement(
     *,
-    agency_id: int | None = None,
-    client_id: int | None = None,
-    itinerary_id: int | None = None,
-    status: str | None = None,
-) -> Sequence[models.FlightBooking]:
-    statement = (
-        select(models.FlightBooking)
-        .options(
-            selectinload(models.FlightBooking.segments),
-            selectinload(models.FlightBooking.client),
-            selectinload(models.FlightBooking.agency),
-            selectinload(models.FlightBooking.itinerary),
-        )
-        .order_by(models.FlightBooking.created_at.desc())
+    agency_id: int | None,
+    client_id: int | None,
+    itinerary_id: int | None,
+    status: str | None,
+) -> Any:
+    statement = select(models.FlightBooking).options(
+        selectinload(models.FlightBooking.segments),
+        selectinload(models.FlightBooking.client),
+        selectinload(models.FlightBooking.agency),
+        selectinload(models.FlightBooking.itinerary),
     )
     if agency_id is not None:
         statement = statement.where(models.FlightBooking.agency_id == agency_id)
@@ -1749,7 +2051,30 @@ def list_flight_bookings(
         statement = statement.where(models.FlightBooking.itinerary_id == itinerary_id)
     if status is not None:
         statement = statement.where(models.FlightBooking.status == status)
-    return session.scalars(statement).unique().all()
+    return statement
+
+
+def list_flight_bookings_page(
+    session: Session,
+    *,
+    agency_id: int | None = None,
+    client_id: int | None = None,
+    itinerary_id: int | None = None,
+    status: str | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int = 50,
+) -> tuple[list[models.FlightBooking], tuple[datetime, int] | None]:
+    return _keyset_page(
+        session,
+        _flight_bookings_statement(
+            agency_id=agency_id, client_id=client_id, itinerary_id=itinerary_id, status=status
+        ),
+        models.FlightBooking.created_at,
+        models.FlightBooking.id,
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
 
 def get_flight_booking(
@@ -1765,25 +2090,23 @@ def get_flight_booking(
         )
         .where(models.FlightBooking.id == booking_id)
     )
-    return session.scalars(statement).unique().first()
+    return session.scalars(statement).first()
 
 
 def create_flight_booking(
     session: Session, payload: schemas.FlightBookingCreate
 ) -> models.FlightBooking:
     data = payload.model_dump(exclude={"segments"})
-    segments = payload.segments
-    booking = models.FlightBooking(**data)
+    # Building the segments through the relationship keeps the collection
+    # loaded, so callers can serialize the booking without reloading it.
+    booking = models.FlightBooking(
+        **data,
+        segments=[models.FlightSegment(**segment.model_dump()) for segment in payload.segments],
+    )
     booking.pnr = _generate_unique_pnr(session)
     session.add(booking)
     session.flush()
 
-    for segment in segments:
-        segment_data = segment.model_dump()
-        session.add(models.FlightSegment(booking_id=booking.id, **segment_data))
-
-    session.flush()
-
     agency = session.get(models.TravelAgency, booking.agency_id)
     client = session.get(models.Client, booking.client_id) if booking.client_id else None
     metadata: Dict[str, Any] = {
@@ -1883,6 +2206,7 @@ def upsert_site_setting(
         setting = models.SiteSetting(key=key, value=value)
     session.add(setting)
     session.flush()
+    cache.invalidate_on_commit(session, cache.SITE_SETTINGS_KEY, cache.LANDING_PAGE_KEY)
     return setting
 
 
@@ -1939,6 +2263,17 @@ def list_notifications(session: Session, limit: int = 100) -> Sequence[models.No
     return session.scalars(statement).all()
 
 
+def iter_notifications(
+    session: Session, limit: int = 100, *, batch_size: int = 100
+) -> Iterator[models.NotificationLog]:
+    statement = (
+        select(models.NotificationLog)
+        .order_by(models.NotificationLog.created_at.desc())
+        .limit(limit)
+    )
+    return iter(session.scalars(statement.execution_options(yield_per=batch_size)))
+
+
 def notification_summary(session: Session) -> schemas.NotificationSummary:
     notifications = list_notifications(session, limit=1000)
     by_channel: Dict[str, int] = {}
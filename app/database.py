@@ -11,33 +11,34 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./tour_planner.db")
+POOL_SIZE = 20
+POOL_MAX_OVERFLOW = 40
+POOL_CAPACITY = POOL_SIZE + POOL_MAX_OVERFLOW
+# Room for every distinct statement shape, including selectin loader variants.
+QUERY_CACHE_SIZE = 1200
 
 
 def _build_engine(url: str):
     """Create the SQLAlchemy engine with backend-specific tuning."""
 
-    engine_kwargs = {"future": True, "echo": False}
+    engine_kwargs = {"future": True, "echo": False, "query_cache_size": QUERY_CACHE_SIZE}
     dialect = make_url(url).get_backend_name()
 
     if dialect == "sqlite":
         # SQLite needs a special flag for usage with FastAPI's threaded test client.
         engine_kwargs["connect_args"] = {"check_same_thread": False}
     else:
-        # Enable pool pre-ping so long-lived connections recover gracefully.
+        # Enable pool pre-ping so long-lived connections recover gracefully and
+        # size the pool for concurrent request handlers.
         engine_kwargs["pool_pre_ping"] = True
+        engine_kwargs["pool_size"] = POOL_SIZE
+        engine_kwargs["max_overflow"] = POOL_MAX_OVERFLOW
+        engine_kwargs["pool_recycle"] = 3600
 
     return create_engine(url, **engine_kwargs)
 
 
 engine = _build_engine(DATABASE_URL)
-
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
-
-DATABASE_URL = "sqlite:///./tour_planner.db"
-
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, future=True, echo=False
-)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 Base = declarative_base()
@@ -2,59 +2,48 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict
 
+import anyio.to_thread
 from fastapi import Depends, FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
-from . import crud, schemas
-from fastapi import FastAPI
-
+from . import crud, schemas, utils
 from .api import router as api_router
 from .api.deps import get_db
-from .database import Base, engine
+from .api.responses import DecimalORJSONResponse
+from .database import POOL_CAPACITY, Base, engine
 
 Base.metadata.create_all(bind=engine)
 
 templates = Jinja2Templates(directory="app/templates")
 
 
-def create_application() -> FastAPI:
-    app = FastAPI(title="Tour Planner API", version="4.0.0")
-DEFAULT_LANDING = schemas.LandingPageContent(
-    headline="Build unforgettable journeys with confidence",
-    subheadline="Streamline itineraries, finances, and supplier management in one dashboard.",
-    call_to_action="Start planning now",
-    seo_description="Tour itinerary builder software for travel agencies with CRM, finance, and supplier marketplace.",
-    hero_image_url="https://example.com/hero.jpg",
-    meta_keywords=["tour planner", "travel agency software", "itinerary builder"],
-)
+def _configure_threadpool() -> None:
+    """Allow as many concurrent sync handlers as there are pooled connections."""
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, POOL_CAPACITY)
 
 
 def create_application() -> FastAPI:
-    app = FastAPI(title="Tour Planner API", version="3.0.0")
+    app = FastAPI(
+        title="Tour Planner API",
+        version="4.0.0",
+        default_response_class=DecimalORJSONResponse,
+    )
+    app.add_event_handler("startup", _configure_threadpool)
+    app.add_event_handler("startup", utils.warm_template_cache)
     app.include_router(api_router)
 
     @app.get("/", response_class=HTMLResponse, tags=["marketing"], summary="SEO landing page")
     def landing_page(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
         content = crud.get_landing_page_content(db)
-        settings: Dict[str, str] = {setting.key: setting.value for setting in crud.list_site_settings(db)}
-        content = DEFAULT_LANDING.model_copy()
         packages = [
             schemas.SubscriptionPackage.model_validate(pkg)
             for pkg in crud.list_subscription_packages(db, only_active=True)
         ]
-
-        for field in ("headline", "subheadline", "call_to_action", "seo_description", "hero_image_url"):
-            if field in settings:
-                setattr(content, field, settings[field])
-
-        keywords = settings.get("meta_keywords")
-        if keywords:
-            content.meta_keywords = [keyword.strip() for keyword in keywords.split(",") if keyword.strip()]
-
         return templates.TemplateResponse(
             request,
             "landing.html",
@@ -66,16 +55,6 @@ def create_application() -> FastAPI:
         )
 
     @app.get("/health", tags=["health"], summary="Service healthcheck")
-            {"content": content, "current_year": datetime.utcnow().year},
-        )
-
-    @app.get("/health", tags=["health"], summary="Service healthcheck")
-
-def create_application() -> FastAPI:
-    app = FastAPI(title="Tour Planner API", version="2.0.0")
-    app.include_router(api_router)
-
-    @app.get("/", tags=["health"], summary="Service healthcheck")
     def healthcheck() -> dict[str, str]:
         return {"status": "ok", "message": "Tour Planner API is running"}
 
@@ -10,12 +10,14 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy import Boolean, CheckConstraint, Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
 from sqlalchemy.orm import relationship
@@ -129,6 +131,8 @@ class Client(Base, TimestampMixin):
         "FlightBooking", back_populates="client", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("ix_clients_name_id", "name", "id"),)
+
 
 class Lead(Base, TimestampMixin):
     __tablename__ = "leads"
@@ -147,6 +151,8 @@ class Lead(Base, TimestampMixin):
 
     client = relationship("Client", back_populates="leads")
 
+    __table_args__ = (Index("ix_leads_created_at_id", "created_at", "id"),)
+
 
 class TourPackage(Base, TimestampMixin):
     __tablename__ = "tour_packages"
@@ -227,6 +233,7 @@ class Itinerary(Base, TimestampMixin):
 
     __table_args__ = (
         CheckConstraint("end_date >= start_date", name="check_dates"),
+        Index("ix_itineraries_start_date_id", "start_date", "id"),
     )
 
 
@@ -273,6 +280,8 @@ class Invoice(Base, TimestampMixin):
     itinerary = relationship("Itinerary", back_populates="invoices")
     payments = relationship("Payment", back_populates="invoice", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_invoices_issue_date_id", "issue_date", "id"),)
+
 
 class Payment(Base, TimestampMixin):
     __tablename__ = "payments"
@@ -292,6 +301,12 @@ class Payment(Base, TimestampMixin):
 
     invoice = relationship("Invoice", back_populates="payments")
 
+    # Backs the case-insensitive completed-payment filter in finance_totals.
+    __table_args__ = (
+        Index("ix_payments_status_lower", func.lower(status)),
+        Index("ix_payments_paid_on_id", "paid_on", "id"),
+    )
+
 
 class Expense(Base, TimestampMixin):
     __tablename__ = "expenses"
@@ -304,6 +319,8 @@ class Expense(Base, TimestampMixin):
     incurred_on = Column(Date, default=date.today, nullable=False)
     reimbursable = Column(Boolean, default=False)
 
+    __table_args__ = (Index("ix_expenses_incurred_on_id", "incurred_on", "id"),)
+
 
 class Supplier(Base, TimestampMixin):
     __tablename__ = "suppliers"
@@ -463,6 +480,8 @@ class FlightBooking(Base, TimestampMixin):
         "FlightSegment", back_populates="booking", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("ix_flight_bookings_created_at_id", "created_at", "id"),)
+
 
 class FlightSegment(Base, TimestampMixin):
     __tablename__ = "flight_segments"
@@ -533,6 +552,8 @@ class MediaAsset(Base, TimestampMixin):
         passive_deletes=True,
     )
 
+    __table_args__ = (Index("ix_media_assets_created_at_id", "created_at", "id"),)
+
 
 class ItineraryItemMedia(Base, TimestampMixin):
     __tablename__ = "itinerary_item_media"
@@ -2,12 +2,10 @@
 from __future__ import annotations
 
 import json
-"""Pydantic schemas describing the API payloads."""
-from __future__ import annotations
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
 
 from pydantic import (
     BaseModel,
@@ -19,7 +17,7 @@ from pydantic import (
     model_validator,
 )
 
-from .constants import ADMIN_ROLES, ASSIGNABLE_AGENCY_ROLES, USER_ROLES
+from .constants import ADMIN_ROLES, ASSIGNABLE_AGENCY_ROLES, MAX_MEDIA_TAGS, USER_ROLES
 from .utils import SUPPORTED_PAYMENT_PROVIDERS
 
 
@@ -44,6 +42,18 @@ class TimestampMixin(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+ItemT = TypeVar("ItemT")
+
+
+class Page(BaseModel, Generic[ItemT]):
+    """One keyset-paginated slice of a listing."""
+
+    items: List[ItemT]
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; null on the last page"
+    )
+
+
 class ClientBase(BaseModel):
     name: str = Field(..., description="Client full name")
     email: Optional[EmailStr] = Field(None, description="Primary email address")
@@ -179,7 +189,7 @@ class MediaAsset(MediaAssetBase, TimestampMixin):
 
 class MediaAssetUpdate(BaseModel):
     alt_text: Optional[str] = None
-    tags: Optional[List[str]] = None
+    tags: Optional[List[str]] = Field(None, max_length=MAX_MEDIA_TAGS)
     agency_id: Optional[int] = None
 
     @field_validator("tags", mode="before")
@@ -242,6 +252,10 @@ class ItineraryItemCreate(ItineraryItemBase):
     pass
 
 
+class ItineraryItemUpdate(ItineraryItemCreate):
+    id: Optional[int] = Field(None, description="Existing item to update; omit to add one")
+
+
 class ItineraryItem(ItineraryItemBase, TimestampMixin):
     id: int
     media: List[ItineraryItemMedia] = Field(
@@ -297,6 +311,10 @@ class ItineraryExtensionCreate(ItineraryExtensionBase):
     pass
 
 
+class ItineraryExtensionUpdate(ItineraryExtensionCreate):
+    id: Optional[int] = Field(None, description="Existing extension to update; omit to add one")
+
+
 class ItineraryExtension(ItineraryExtensionBase, TimestampMixin):
     id: int
 
@@ -313,6 +331,10 @@ class ItineraryNoteCreate(ItineraryNoteBase):
     pass
 
 
+class ItineraryNoteUpdate(ItineraryNoteCreate):
+    id: Optional[int] = Field(None, description="Existing note to update; omit to add one")
+
+
 class ItineraryNote(ItineraryNoteBase, TimestampMixin):
     id: int
 
@@ -336,7 +358,7 @@ class ItineraryUpdate(BaseModel):
     end_date: Optional[date] = None
     total_price: Optional[Decimal] = None
     status: Optional[str] = None
-    items: Optional[List[ItineraryItemCreate]] = None
+    items: Optional[List[ItineraryItemUpdate]] = None
     estimate_amount: Optional[Decimal] = None
     estimate_currency: Optional[str] = None
     brand_logo_url: Optional[str] = None
@@ -345,8 +367,8 @@ class ItineraryUpdate(BaseModel):
     brand_footer_note: Optional[str] = None
     markup_strategy: Optional[Literal["flat", "percentage"]] = None
     target_margin: Optional[Decimal] = None
-    extensions: Optional[List[ItineraryExtensionCreate]] = None
-    notes: Optional[List[ItineraryNoteCreate]] = None
+    extensions: Optional[List[ItineraryExtensionUpdate]] = None
+    notes: Optional[List[ItineraryNoteUpdate]] = None
 
 
 class Itinerary(ItineraryBase, TimestampMixin):
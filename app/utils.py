@@ -3,15 +3,11 @@ from __future__ import annotations
 
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from io import BytesIO
+from io import SEEK_END
 from pathlib import Path
 from random import randint
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
-from typing import Dict, Iterable, List, Optional
-from io import BytesIO
-from pathlib import Path
-from random import randint
-from typing import Iterable, List, Optional
+from shutil import copyfileobj
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from jinja2 import Environment, PackageLoader, select_autoescape
@@ -91,13 +87,29 @@ TRAVEL_DOCUMENT_TEMPLATES: Dict[str, str] = {
 }
 PORTAL_TEMPLATE = "client_portal.html"
 
+# Templates ship with the package and never change at runtime, so compiled
+# templates are kept for the life of the process without mtime checks.
 _ENV = Environment(
     loader=PackageLoader("app", "templates"),
     autoescape=select_autoescape(["html", "xml"]),
     enable_async=False,
+    auto_reload=False,
+    cache_size=-1,
 )
 
 
+def warm_template_cache() -> None:
+    """Compile every shipped template up front so first renders skip parsing."""
+
+    for template_name in (
+        *ITINERARY_LAYOUT_TEMPLATES.values(),
+        *TRAVEL_DOCUMENT_TEMPLATES.values(),
+        FLIGHT_TICKET_TEMPLATE,
+        PORTAL_TEMPLATE,
+    ):
+        _ENV.get_template(template_name)
+
+
 def _ensure_media_directories() -> None:
     for directory in (ORIGINAL_MEDIA_DIR, OPTIMIZED_MEDIA_DIR):
         directory.mkdir(parents=True, exist_ok=True)
@@ -229,40 +241,30 @@ def generate_itinerary_suggestions(
             }
         )
     return suggestions
-    return template.render(itinerary=itinerary, selected_layout=normalized_layout)
-"""Utility helpers for itinerary formatting."""
-from __future__ import annotations
-
-from typing import Iterable
-
-from jinja2 import Environment, PackageLoader, select_autoescape
-
-from . import models
 
 
-def render_itinerary(itinerary: models.Itinerary) -> str:
-    """Render an itinerary into a printable text/HTML hybrid document."""
-    env = Environment(
-        loader=PackageLoader("app", "templates"),
-        autoescape=select_autoescape(["html", "xml"]),
-        enable_async=False,
-    )
-    template = env.get_template("itinerary.html")
-    return template.render(itinerary=itinerary)
-
+def optimize_image_upload(source: BinaryIO, filename: str) -> dict[str, int | str]:
+    """Persist an uploaded image and generate an optimized rendition.
 
-def optimize_image_upload(data: bytes, filename: str) -> dict[str, int | str]:
-    """Persist an uploaded image and generate an optimized rendition."""
+    ``source`` is read in place (typically the upload's spooled temporary
+    file) so large uploads are never held in memory as a single bytes object.
+    """
 
-    if not data:
+    if not source.seek(0, SEEK_END):
         raise ValueError("Uploaded file is empty")
+    source.seek(0)
 
     try:
-        image = Image.open(BytesIO(data))
+        image = Image.open(source)
     except Exception as exc:  # pragma: no cover - defensive branch
         raise ValueError("Uploaded file is not a valid image") from exc
 
-    image = image.convert("RGB")
+    # Palette and bilevel images would be resized with nearest-neighbour, so
+    # expand them first. Everything else is converted after the thumbnail so
+    # the full-size frame is never copied or converted, and very large JPEGs
+    # can be scaled down while decoding.
+    if image.mode in ("P", "1"):
+        image = image.convert("RGB")
     _ensure_media_directories()
 
     base_name = uuid4().hex
@@ -270,11 +272,13 @@ def optimize_image_upload(data: bytes, filename: str) -> dict[str, int | str]:
     original_path = ORIGINAL_MEDIA_DIR / f"{base_name}{original_suffix}"
     optimized_path = OPTIMIZED_MEDIA_DIR / f"{base_name}.jpg"
 
+    image.thumbnail((1600, 1600), Image.LANCZOS)
+    optimized_image = image.convert("RGB")
+
+    source.seek(0)
     with original_path.open("wb") as original_file:
-        original_file.write(data)
+        copyfileobj(source, original_file)
 
-    optimized_image = image.copy()
-    optimized_image.thumbnail((1600, 1600), Image.LANCZOS)
     optimized_image.save(optimized_path, format="JPEG", optimize=True, quality=85)
     width, height = optimized_image.size
     file_size = optimized_path.stat().st_size
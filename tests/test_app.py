@@ -5,6 +5,7 @@ import shutil
 import json
 import sys
 from datetime import date
+from decimal import Decimal
 from pathlib import Path
 from typing import Generator
 
@@ -20,7 +21,7 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app import crud, schemas  # noqa: E402
+from app import cache, crud, schemas  # noqa: E402
 from app.database import Base  # noqa: E402
 from app.main import app, get_db  # noqa: E402
 from app.utils import MEDIA_ROOT  # noqa: E402
@@ -43,9 +44,7 @@ def reset_database() -> None:
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     reset_media_storage()
-def reset_database() -> None:
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    cache.clear()
 
 
 reset_database()
@@ -145,11 +144,6 @@ def create_sample_itinerary(client: TestClient, client_id: int) -> int:
 def test_create_itinerary_and_print(api_client: TestClient) -> None:
     client_id = create_sample_client(api_client)
     asset_id = upload_sample_media_asset(api_client)
-def test_create_itinerary_and_print(api_client: TestClient) -> None:
-    client_id = create_sample_client(api_client)
-    asset_id = upload_sample_media_asset(api_client)
-def test_create_itinerary_and_print(api_client: TestClient) -> None:
-    client_id = create_sample_client(api_client)
     itinerary_payload = {
         "client_id": client_id,
         "title": "Bali Adventure",
@@ -239,7 +233,7 @@ def test_create_itinerary_and_print(api_client: TestClient) -> None:
     assert "Bali Adventure" in html
     assert "Day 1" in html
     assert "Optional Extensions" in html
-    assert "Traveler Guidance" in html
+    assert "Travel Briefing" in html
     assert "Client Estimate" in html
     assert "Thank you for choosing Explorer Collective." in html
 
@@ -309,6 +303,18 @@ def test_finance_summary_flow(api_client: TestClient) -> None:
 
     summary = api_client.get("/finance/summary")
     assert summary.status_code == 200
+    data = summary.json()
+    assert data["total_invoiced"] == 1500.0
+    assert data["total_paid"] == 1000.0
+    assert data["total_expenses"] == 300.0
+    assert data["outstanding"] == 500.0
+    assert data["profitability"] == 700.0
+
+    sales = api_client.get(
+        "/reports/sales", params={"start": "2024-06-01", "end": "2024-06-30"}
+    )
+    assert sales.status_code == 200
+    assert sales.json() == {"monthly": {"2024-06": {"invoiced": 1500.0, "paid": 500.0}}}
 
 
 def test_subscription_packages_visible_on_landing(api_client: TestClient) -> None:
@@ -365,12 +371,6 @@ def test_subscription_packages_visible_on_landing(api_client: TestClient) -> Non
     landing_html = landing_page.text
     assert "Growth" in landing_html
     assert "Unlimited itinerary exports" in landing_html
-    data = summary.json()
-    assert data["total_invoiced"] == 1500.0
-    assert data["total_paid"] == 500.0
-    assert data["total_expenses"] == 300.0
-    assert data["outstanding"] == 1000.0
-    assert data["profitability"] == 200.0
 
 
 def test_generate_invoice_from_itinerary(api_client: TestClient) -> None:
@@ -510,7 +510,7 @@ def test_media_admin_management(api_client: TestClient) -> None:
 
     media_listing = api_client.get("/media/assets")
     assert media_listing.status_code == 200
-    assert any(asset["id"] == asset_id for asset in media_listing.json())
+    assert any(asset["id"] == asset_id for asset in media_listing.json()["items"])
 
     admin_listing = api_client.get("/admin/media")
     assert admin_listing.status_code == 200
@@ -694,6 +694,45 @@ def test_admin_controls_and_landing_page(api_client: TestClient) -> None:
     assert any(setting["key"] == "headline" for setting in settings_list.json())
 
 
+def test_client_listing_uses_cursor_pagination(api_client: TestClient) -> None:
+    for name in ("Cara", "Abel", "Bea"):
+        response = api_client.post("/clients", json={"name": name})
+        assert response.status_code == 201
+
+    first_page = api_client.get("/clients", params={"limit": 2})
+    assert first_page.status_code == 200
+    first_body = first_page.json()
+    assert [client["name"] for client in first_body["items"]] == ["Abel", "Bea"]
+    assert first_body["next_cursor"]
+
+    second_page = api_client.get(
+        "/clients", params={"limit": 2, "cursor": first_body["next_cursor"]}
+    )
+    second_body = second_page.json()
+    assert [client["name"] for client in second_body["items"]] == ["Cara"]
+    assert second_body["next_cursor"] is None
+
+    invalid_cursor = api_client.get("/clients", params={"cursor": "not-a-cursor"})
+    assert invalid_cursor.status_code == 400
+
+
+def test_client_detail_supports_conditional_get(api_client: TestClient) -> None:
+    client_id = create_sample_client(api_client)
+
+    first = api_client.get(f"/clients/{client_id}")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = api_client.get(f"/clients/{client_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    update = api_client.put(f"/clients/{client_id}", json={"phone": "+254700000000"})
+    assert update.status_code == 200
+    refreshed = api_client.get(f"/clients/{client_id}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
 def test_agency_staff_management(api_client: TestClient) -> None:
     create_super_admin_user()
     agency_response = api_client.post(
@@ -766,6 +805,15 @@ def test_amadeus_search_supports_multi_city(api_client: TestClient) -> None:
         assert offer["segments"][0]["origin"] == "NBO"
         assert offer["segments"][-1]["destination"] == "DXB"
 
+    repeated = api_client.get(
+        "/flights/search",
+        params=[
+            (key, value.upper() if key == "travel_class" else value) for key, value in params
+        ],
+    )
+    assert repeated.status_code == 200
+    assert repeated.content == offers_response.content
+
 
 def test_flight_booking_requires_subscription(api_client: TestClient) -> None:
     agency_payload = {
@@ -931,7 +979,7 @@ def test_flight_booking_panel_flow(api_client: TestClient) -> None:
 
     list_response = api_client.get("/flights/bookings", params={"agency_id": agency_id})
     assert list_response.status_code == 200
-    assert list_response.json()[0]["pnr"] == booking_body["pnr"]
+    assert list_response.json()["items"][0]["pnr"] == booking_body["pnr"]
 
     ticket_payload = {
         "ticket_numbers": ["176000000001", "176000000002"],
@@ -1073,3 +1121,58 @@ def test_portal_invitation_and_analytics(api_client: TestClient) -> None:
 
     delete_response = api_client.delete(f"/portal/invitations/{token}")
     assert delete_response.status_code == 204
+
+
+def test_app_routes_render_decimals_losslessly(api_client: TestClient) -> None:
+    health = api_client.get("/health")
+    assert health.status_code == 200
+    assert health.content == b'{"status":"ok","message":"Tour Planner API is running"}'
+
+    rendered = app.router.default_response_class({"amount": Decimal("1234.50")})
+    assert rendered.body == b'{"amount":"1234.50"}'
+
+
+def test_itinerary_creation_inserts_a_single_row(api_client: TestClient) -> None:
+    client_id = create_sample_client(api_client)
+    itinerary_id = create_sample_itinerary(api_client, client_id)
+
+    listing = api_client.get("/itineraries")
+    assert listing.status_code == 200
+    assert [itinerary["id"] for itinerary in listing.json()["items"]] == [itinerary_id]
+
+
+def test_itinerary_update_keeps_existing_item_rows(api_client: TestClient) -> None:
+    client_id = create_sample_client(api_client)
+    itinerary_id = create_sample_itinerary(api_client, client_id)
+    original = api_client.get(f"/itineraries/{itinerary_id}").json()["items"]
+
+    response = api_client.put(
+        f"/itineraries/{itinerary_id}",
+        json={
+            "items": [
+                {"id": original[0]["id"], "day_number": 1, "title": "Arrival and briefing"},
+                {"day_number": 2, "title": "Game drive"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0]["id"] == original[0]["id"]
+    assert [item["title"] for item in items] == ["Arrival and briefing", "Game drive"]
+    assert items[0]["description"] is None
+
+    game_drive = items[1]
+    response = api_client.put(
+        f"/itineraries/{itinerary_id}",
+        json={"items": [{"id": game_drive["id"], "day_number": 1, "title": "Game drive"}]},
+    )
+    assert response.status_code == 200
+    assert [(item["id"], item["day_number"]) for item in response.json()["items"]] == [
+        (game_drive["id"], 1)
+    ]
+
+    unknown = api_client.put(
+        f"/itineraries/{itinerary_id}",
+        json={"items": [{"id": original[0]["id"], "day_number": 1, "title": "Arrival"}]},
+    )
+    assert unknown.status_code == 400